@@ -0,0 +1,144 @@
+"""
+Agora RTC token (AccessToken v006) builder.
+
+Produces the same tokens as agora_token_builder.RtcTokenBuilder, but packs
+the message with one struct.pack call and signs it by copying an HMAC
+keyed once per certificate instead of building an AccessToken object
+(and re-deriving the HMAC key pads) per mint.
+"""
+import base64
+import hmac
+import secrets
+import struct
+import time
+from functools import lru_cache
+from typing import Tuple
+from zlib import crc32
+
+from .constants import AGORA_APP_CERT, AGORA_APP_ID, MAX_TOKEN_EXPIRE_SECONDS, ROLE_PUBLISHER
+
+TOKEN_VERSION = "006"
+
+# Privilege ids, in the (sorted) order they are packed
+PRIVILEGE_JOIN_CHANNEL = 1
+PRIVILEGE_PUBLISH_AUDIO = 2
+PRIVILEGE_PUBLISH_VIDEO = 3
+PRIVILEGE_PUBLISH_DATA = 4
+
+# Attendee (0) and Admin (101) are deprecated aliases of publisher
+_PUBLISHER_ROLES = frozenset({0, ROLE_PUBLISHER, 101})
+
+# Token validity window embedded in the message (independent of privileges)
+_MESSAGE_TTL_SECONDS = 24 * 3600
+
+# Identical requests within one bucket reuse the same token; the privilege
+# expiry is rounded up to the bucket end so the cached token stays truthful.
+TOKEN_CACHE_BUCKET_SECONDS = 60
+TOKEN_CACHE_MAX_ENTRIES = 4096
+
+_random = secrets.SystemRandom()
+
+_SUBSCRIBER_MESSAGE = struct.Struct("<IIHHI")
+_PUBLISHER_MESSAGE = struct.Struct("<IIHHIHIHIHI")
+
+
+def _pack_message(salt: int, ts: int, role: int, expire_ts: int) -> bytes:
+    if role in _PUBLISHER_ROLES:
+        return _PUBLISHER_MESSAGE.pack(
+            salt, ts, 4,
+            PRIVILEGE_JOIN_CHANNEL, expire_ts,
+            PRIVILEGE_PUBLISH_AUDIO, expire_ts,
+            PRIVILEGE_PUBLISH_VIDEO, expire_ts,
+            PRIVILEGE_PUBLISH_DATA, expire_ts,
+        )
+    return _SUBSCRIBER_MESSAGE.pack(salt, ts, 1, PRIVILEGE_JOIN_CHANNEL, expire_ts)
+
+
+@lru_cache(maxsize=None)
+def _signer(app_cert: str) -> "hmac.HMAC":
+    # Keyed HMAC template; copy() skips re-hashing the padded key per token
+    return hmac.new(app_cert.encode("utf-8"), digestmod="sha256")
+
+
+def _build(app_id: str, app_cert: str, channel: str, uid_str: str, role: int,
+           expire_ts: int, salt: int, ts: int) -> str:
+    channel_bytes = channel.encode("utf-8")
+    uid_bytes = uid_str.encode("utf-8")
+    message = _pack_message(salt, ts, role, int(expire_ts))
+
+    mac = _signer(app_cert).copy()
+    mac.update(app_id.encode("utf-8") + channel_bytes + uid_bytes + message)
+    signature = mac.digest()
+    content = b"".join((
+        struct.pack("<H", len(signature)),
+        signature,
+        struct.pack("<IIH", crc32(channel_bytes), crc32(uid_bytes), len(message)),
+        message,
+    ))
+    return TOKEN_VERSION + app_id + base64.b64encode(content).decode("ascii")
+
+
+def build_rtc_token(app_id: str, app_cert: str, channel: str, account, role: int, expire_ts: int) -> str:
+    """
+    Build an RTC token for a uid (int) or user account (str).
+
+    uid 0 means "any uid", matching RtcTokenBuilder.buildTokenWithUid.
+    """
+    uid_str = "" if account == 0 else str(account)
+    return _build(
+        app_id,
+        app_cert,
+        channel,
+        uid_str,
+        role,
+        expire_ts,
+        salt=_random.randint(1, 99999999),
+        ts=int(time.time()) + _MESSAGE_TTL_SECONDS,
+    )
+
+
+@lru_cache(maxsize=TOKEN_CACHE_MAX_ENTRIES)
+def _cached_token(app_id: str, app_cert: str, channel: str, uid_str: str, role: int, expire_ts: int) -> str:
+    return _build(
+        app_id,
+        app_cert,
+        channel,
+        uid_str,
+        role,
+        expire_ts,
+        salt=_random.randint(1, 99999999),
+        ts=int(time.time()) + _MESSAGE_TTL_SECONDS,
+    )
+
+
+def cached_rtc_token(app_id: str, app_cert: str, channel: str, account, role: int, expire_ts: int) -> Tuple[str, int]:
+    """
+    build_rtc_token memoized per TOKEN_CACHE_BUCKET_SECONDS expiry bucket.
+
+    Returns (token, effective_expire_ts); the expiry is rounded up to the
+    bucket end, so a token never expires before the requested time, unless
+    that would pass MAX_TOKEN_EXPIRE_SECONDS from now, in which case it is
+    rounded down to the bucket start instead.
+    Lifetimes shorter than one bucket are built uncached with the exact expiry.
+    """
+    expire_ts = int(expire_ts)
+    now = time.time()
+    if expire_ts - now < TOKEN_CACHE_BUCKET_SECONDS:
+        return build_rtc_token(app_id, app_cert, channel, account, role, expire_ts), expire_ts
+    uid_str = "" if account == 0 else str(account)
+    bucket_end = expire_ts + -expire_ts % TOKEN_CACHE_BUCKET_SECONDS
+    if bucket_end <= now + MAX_TOKEN_EXPIRE_SECONDS:
+        expire_ts = bucket_end
+    else:
+        expire_ts -= expire_ts % TOKEN_CACHE_BUCKET_SECONDS
+    return _cached_token(app_id, app_cert, channel, uid_str, role, expire_ts), expire_ts
+
+
+def build_uid_token(channel: str, uid: int, role: int, expire_ts: int) -> Tuple[str, int]:
+    """cached_rtc_token for a numeric uid with the configured Agora credentials."""
+    return cached_rtc_token(AGORA_APP_ID, AGORA_APP_CERT, channel, uid, role, expire_ts)
+
+
+def build_account_token(channel: str, account: str, role: int, expire_ts: int) -> Tuple[str, int]:
+    """cached_rtc_token for a string user account with the configured Agora credentials."""
+    return cached_rtc_token(AGORA_APP_ID, AGORA_APP_CERT, channel, str(account), role, expire_ts)
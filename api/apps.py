@@ -0,0 +1,46 @@
+import logging
+import os
+import sys
+
+from django.apps import AppConfig
+
+logger = logging.getLogger("api")
+
+
+def _should_warm_up() -> bool:
+    if os.environ.get("FIREBASE_WARMUP", "1") != "1":
+        return False
+    if os.path.basename(sys.argv[0]) == "manage.py":
+        # Only the serving process of runserver (not the autoreloader parent,
+        # not migrate/test/shell) should open Firebase connections.
+        return sys.argv[1:2] == ["runserver"] and os.environ.get("RUN_MAIN") == "true"
+    return True
+
+
+class ApiConfig(AppConfig):
+    name = "api"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from .log_queue import start_listener
+
+        start_listener()
+
+        if not _should_warm_up():
+            return
+
+        # Pay firebase-admin init (credentials, gRPC channel) at boot instead
+        # of on the first incoming call.
+        from .firebase_service import firestore_service
+        from .push_service import push_service
+
+        try:
+            if not firestore_service.is_available():
+                logger.warning("[WARMUP] Firestore not available")
+                return
+            _ = firestore_service.users_collection
+            _ = firestore_service.calls_collection
+            push_service.fcm.is_configured()
+            logger.info("[WARMUP] Firebase clients initialized")
+        except Exception as exc:
+            logger.error("[WARMUP] Firebase warm-up failed: %s", exc)
@@ -10,3 +10,7 @@ MISSED_TIMEOUT_SECONDS = 60
 
 # Local recording service URL
 RECORDER_SERVICE_URL = os.environ.get("RECORDER_SERVICE_URL", "http://localhost:3100")
+
+# Agora credentials (read once at import)
+AGORA_APP_ID = os.environ.get("AGORA_APP_ID")
+AGORA_APP_CERT = os.environ.get("AGORA_APP_CERT")
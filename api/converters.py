@@ -0,0 +1,10 @@
+class CallIdConverter:
+    """Call ids are UUID strings; match a bounded ASCII id charset."""
+
+    regex = r"[A-Za-z0-9_-]{1,64}"
+
+    def to_python(self, value: str) -> str:
+        return value
+
+    def to_url(self, value: str) -> str:
+        return value
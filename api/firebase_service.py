@@ -5,14 +5,33 @@ Firestore Collections:
 - users/{uid}: Contains fcmToken, voipToken for push notifications
 - calls/{callId}: Call records with status, participants, timestamps
 """
+import asyncio
+import itertools
 import os
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from django.utils import timezone
 
 logger = logging.getLogger("api")
 
+try:
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+except ImportError:
+    SERVER_TIMESTAMP = None
+
+
+def server_timestamp():
+    """
+    Firestore server-time sentinel for write payloads, so timestamps come
+    from the server clock. Falls back to local time without the SDK.
+    """
+    return SERVER_TIMESTAMP if SERVER_TIMESTAMP is not None else timezone.now()
+
 # Firebase Admin initialization
 _firebase_app = None
 _firestore_client = None
@@ -42,8 +61,8 @@ def get_firebase_app():
     use_emulator = os.environ.get("FIREBASE_USE_EMULATOR", "false").lower() == "true"
     project_id = os.environ.get("FIREBASE_PROJECT_ID")
     
-    logger.info(f"Firebase init: use_emulator={use_emulator}, project_id={project_id}")
-    logger.info(f"FIRESTORE_EMULATOR_HOST={os.environ.get('FIRESTORE_EMULATOR_HOST')}")
+    logger.info("Firebase init: use_emulator=%s, project_id=%s", use_emulator, project_id)
+    logger.info("FIRESTORE_EMULATOR_HOST=%s", os.environ.get("FIRESTORE_EMULATOR_HOST"))
     
     if use_emulator:
         # Emulator mode - ensure environment variable is set BEFORE initializing
@@ -58,17 +77,17 @@ def get_firebase_app():
                     "projectId": project_id or "demo-project",
                 }
             )
-            logger.info(f"Firebase Admin initialized with EMULATOR (Firestore: {firestore_host})")
+            logger.info("Firebase Admin initialized with EMULATOR (Firestore: %s)", firestore_host)
         except ValueError as e:
             # Already initialized
             try:
                 _firebase_app = firebase_admin.get_app()
                 logger.info("Firebase Admin already initialized")
             except ValueError:
-                logger.error(f"Firebase init failed: {e}")
+                logger.error("Firebase init failed: %s", e)
                 return None
         except Exception as e:
-            logger.error(f"Firebase emulator init failed: {e}")
+            logger.error("Firebase emulator init failed: %s", e)
             return None
     else:
         # Production mode - need credentials
@@ -83,10 +102,10 @@ def get_firebase_app():
                 cred = credentials.Certificate(sa_dict)
                 logger.info("Using FIREBASE_SERVICE_ACCOUNT env var")
             except json.JSONDecodeError as e:
-                logger.error(f"Invalid FIREBASE_SERVICE_ACCOUNT JSON: {e}")
+                logger.error("Invalid FIREBASE_SERVICE_ACCOUNT JSON: %s", e)
         elif service_account_path and os.path.exists(service_account_path):
             cred = credentials.Certificate(service_account_path)
-            logger.info(f"Using service account from {service_account_path}")
+            logger.info("Using service account from %s", service_account_path)
         
         if cred:
             try:
@@ -120,7 +139,64 @@ def get_firestore():
         _firestore_client = firestore.client()
         return _firestore_client
     except Exception as e:
-        logger.error(f"Failed to get Firestore client: {e}")
+        logger.error("Failed to get Firestore client: %s", e)
+        return None
+
+
+# Extra sync clients (each with its own gRPC channel) to spread concurrent
+# RPCs over several HTTP/2 connections instead of one channel's stream cap.
+FIRESTORE_CLIENT_POOL_SIZE = max(1, int(os.environ.get("FIRESTORE_CLIENT_POOL_SIZE", "4")))
+
+
+def _firestore_credentials(app):
+    if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        from google.auth.credentials import AnonymousCredentials
+        return AnonymousCredentials()
+    return app.credential.get_credential()
+
+
+def create_firestore_pool(size: int = FIRESTORE_CLIENT_POOL_SIZE) -> List[Any]:
+    """
+    Shared Firestore client plus (size - 1) extra clients for the same app.
+    Returns an empty list if Firestore is unavailable.
+    """
+    primary = get_firestore()
+    if primary is None:
+        return []
+
+    pool = [primary]
+    app = get_firebase_app()
+    try:
+        from google.cloud import firestore as gcloud_firestore
+
+        credentials = _firestore_credentials(app)
+        for _ in range(size - 1):
+            pool.append(gcloud_firestore.Client(project=app.project_id, credentials=credentials))
+    except Exception as e:
+        logger.error("Failed to create pooled Firestore clients: %s", e)
+    return pool
+
+
+def create_async_firestore():
+    """
+    Create a Firestore AsyncClient for the Firebase app.
+
+    The async gRPC channel belongs to the event loop that first uses it, so
+    callers keep one client per loop rather than a module-level singleton.
+    """
+    app = get_firebase_app()
+    if app is None:
+        return None
+
+    try:
+        from google.cloud import firestore as gcloud_firestore
+
+        return gcloud_firestore.AsyncClient(
+            project=app.project_id,
+            credentials=_firestore_credentials(app),
+        )
+    except Exception as e:
+        logger.error("Failed to create async Firestore client: %s", e)
         return None
 
 
@@ -130,9 +206,39 @@ class FirestoreService:
     # Collection names
     USERS_COLLECTION = "users"
     CALLS_COLLECTION = "calls"
+
+    # Only these user fields are needed to route a push
+    USER_TOKEN_FIELDS = ["fcmToken", "voipToken", "platform"]
+
+    # Push tokens rarely change; cache them per process (TTL + LRU)
+    TOKEN_CACHE_TTL_SECONDS = 300
+    TOKEN_CACHE_MAX_ENTRIES = 10000
+
+    # Call views re-read the same record several times per call lifecycle;
+    # cache it per process and drop the entry on every write made here.
+    CALL_CACHE_TTL_SECONDS = 60
+    CALL_CACHE_MAX_ENTRIES = 4096
+
+    # Firestore caps a batch at 500 mutations; keep some headroom.
+    BATCH_WRITE_SIZE = 450
+    BATCH_COMMIT_WORKERS = 10
+
+    RESERVE_PUSH_ATTEMPTS = 3
+
+    # Optional fields update_call_status / transition_call_status write
+    CALL_STATUS_FIELDS = ("answeredAt", "endedAt", "durationSec", "lastReviewAt")
     
     def __init__(self):
         self._db = None
+        self._db_pool: Optional[List[Any]] = None
+        self._db_cursor = itertools.count()
+        self._collection_refs: Dict[tuple, Any] = {}
+        self._token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._token_cache_lock = threading.Lock()
+        self._call_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._call_cache_lock = threading.RLock()
+        self._async_db = None
+        self._async_db_loop = None
     
     @property
     def db(self):
@@ -141,6 +247,49 @@ class FirestoreService:
             self._db = get_firestore()
         return self._db
     
+    @property
+    def db_pool(self) -> List[Any]:
+        """Clients that plain document reads/writes are spread across"""
+        if self._db_pool is None:
+            db = self.db
+            if db is None:
+                return []
+            if db is _firestore_client and FIRESTORE_CLIENT_POOL_SIZE > 1:
+                self._db_pool = create_firestore_pool()
+            else:
+                self._db_pool = [db]
+        return self._db_pool
+
+    def _collection(self, name: str):
+        """Collection reference on the next pooled client (refs cached per client)"""
+        pool = self.db_pool
+        if not pool:
+            return None
+        index = next(self._db_cursor) % len(pool)
+        ref = self._collection_refs.get((index, name))
+        if ref is None:
+            ref = pool[index].collection(name)
+            self._collection_refs[(index, name)] = ref
+        return ref
+
+    @property
+    def users_collection(self):
+        """Cached reference to the users collection"""
+        return self._collection(self.USERS_COLLECTION)
+
+    @property
+    def calls_collection(self):
+        """Cached reference to the calls collection"""
+        return self._collection(self.CALLS_COLLECTION)
+
+    def _get_async_db(self):
+        """AsyncClient bound to the running event loop (rebuilt if the loop changes)"""
+        loop = asyncio.get_running_loop()
+        if self._async_db is None or self._async_db_loop is not loop:
+            self._async_db = create_async_firestore()
+            self._async_db_loop = loop
+        return self._async_db
+
     def is_available(self) -> bool:
         """Check if Firestore is available"""
         return self.db is not None
@@ -161,32 +310,64 @@ class FirestoreService:
             ...
         }
         
+        Results for existing users are cached for TOKEN_CACHE_TTL_SECONDS.
+
         Returns:
             Dict with token info or None if not found
         """
+        cached = self._get_cached_tokens(user_id)
+        if cached is not None:
+            return cached
+
         if not self.db:
             logger.warning("Firestore not available")
             return None
 
         try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
-            doc = doc_ref.get()
+            doc_ref = self.users_collection.document(user_id)
+            doc = doc_ref.get(field_paths=self.USER_TOKEN_FIELDS)
 
             if doc.exists:
                 data = doc.to_dict() or {}
-                return {
+                tokens = {
                     "fcmToken": data.get("fcmToken"),
                     "voipToken": data.get("voipToken"),
                     "platform": data.get("platform"),
                     "exists": True,
                 }
-            logger.info(f"User document not found: {user_id}")
+                self._set_cached_tokens(user_id, tokens)
+                return dict(tokens)
+            logger.info("User document not found: %s", user_id)
             return {"exists": False}
 
         except Exception as e:
-            logger.error(f"Error getting user tokens for {user_id}: {e}")
+            logger.error("Error getting user tokens for %s: %s", user_id, e)
             return None
 
+    def invalidate_user_tokens(self, user_id: str) -> None:
+        """Drop cached push tokens so the next lookup re-reads Firestore"""
+        with self._token_cache_lock:
+            self._token_cache.pop(user_id, None)
+
+    def _get_cached_tokens(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._token_cache_lock:
+            entry = self._token_cache.get(user_id)
+            if entry is None:
+                return None
+            stored_at, tokens = entry
+            if time.monotonic() - stored_at >= self.TOKEN_CACHE_TTL_SECONDS:
+                del self._token_cache[user_id]
+                return None
+            self._token_cache.move_to_end(user_id)
+            return dict(tokens)
+
+    def _set_cached_tokens(self, user_id: str, tokens: Dict[str, Any]) -> None:
+        with self._token_cache_lock:
+            self._token_cache[user_id] = (time.monotonic(), tokens)
+            self._token_cache.move_to_end(user_id)
+            while len(self._token_cache) > self.TOKEN_CACHE_MAX_ENTRIES:
+                self._token_cache.popitem(last=False)
+
     # =========================================================================
     # User Management
     # =========================================================================
@@ -196,10 +377,10 @@ class FirestoreService:
             logger.warning("Firestore not available")
             return None
         try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
+            doc_ref = self.users_collection.document(user_id)
             return doc_ref.get().exists
         except Exception as e:
-            logger.error(f"Error checking user exists {user_id}: {e}")
+            logger.error("Error checking user exists %s: %s", user_id, e)
             return None
 
     def create_user(self, user_id: str, payload: Dict[str, Any]) -> bool:
@@ -207,11 +388,12 @@ class FirestoreService:
             logger.warning("Firestore not available")
             return False
         try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
+            doc_ref = self.users_collection.document(user_id)
             doc_ref.set(payload)
+            self.invalidate_user_tokens(user_id)
             return True
         except Exception as e:
-            logger.error(f"Error creating user {user_id}: {e}")
+            logger.error("Error creating user %s: %s", user_id, e)
             return False
 
     def update_user(self, user_id: str, payload: Dict[str, Any]) -> bool:
@@ -219,11 +401,12 @@ class FirestoreService:
             logger.warning("Firestore not available")
             return False
         try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
+            doc_ref = self.users_collection.document(user_id)
             doc_ref.update(payload)
+            self.invalidate_user_tokens(user_id)
             return True
         except Exception as e:
-            logger.error(f"Error updating user {user_id}: {e}")
+            logger.error("Error updating user %s: %s", user_id, e)
             return False
 
     def delete_user(self, user_id: str) -> bool:
@@ -231,10 +414,11 @@ class FirestoreService:
             logger.warning("Firestore not available")
             return False
         try:
-            self.db.collection(self.USERS_COLLECTION).document(user_id).delete()
+            self.users_collection.document(user_id).delete()
+            self.invalidate_user_tokens(user_id)
             return True
         except Exception as e:
-            logger.error(f"Error deleting user {user_id}: {e}")
+            logger.error("Error deleting user %s: %s", user_id, e)
             return False
 
     def update_push_tokens(self, user_id: str, payload: Dict[str, Any]) -> bool:
@@ -242,11 +426,12 @@ class FirestoreService:
             logger.warning("Firestore not available")
             return False
         try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
+            doc_ref = self.users_collection.document(user_id)
             doc_ref.set(payload, merge=True)
+            self.invalidate_user_tokens(user_id)
             return True
         except Exception as e:
-            logger.error(f"Error updating push tokens for {user_id}: {e}")
+            logger.error("Error updating push tokens for %s: %s", user_id, e)
             return False
 
     # =========================================================================
@@ -259,7 +444,7 @@ class FirestoreService:
         try:
             from firebase_admin import firestore as fb_firestore
         except Exception as e:
-            logger.error(f"Failed to import firestore for transaction: {e}")
+            logger.error("Failed to import firestore for transaction: %s", e)
             return {"ok": False, "error": "firestore_unavailable"}
 
         group_ref = self.db.collection("groups").document(group_id)
@@ -277,35 +462,15 @@ class FirestoreService:
                 return {"ok": True, "assigned": False}
             transaction.update(group_ref, {
                 "receiverId": receiver_id,
-                "updatedAt": timezone.now(),
+                "updatedAt": server_timestamp(),
             })
             return {"ok": True, "assigned": True}
 
         try:
             return _txn(self.db.transaction())
         except Exception as e:
-            logger.error(f"Error assigning receiver for group {group_id}: {e}")
+            logger.error("Error assigning receiver for group %s: %s", group_id, e)
             return {"ok": False, "error": "transaction_failed"}
-        
-        try:
-            doc_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
-            doc = doc_ref.get()
-            
-            if doc.exists:
-                data = doc.to_dict()
-                return {
-                    "fcmToken": data.get("fcmToken"),
-                    "voipToken": data.get("voipToken"),
-                    "platform": data.get("platform"),
-                    "exists": True
-                }
-            else:
-                logger.info(f"User document not found: {user_id}")
-                return {"exists": False}
-                
-        except Exception as e:
-            logger.error(f"Error getting user tokens for {user_id}: {e}")
-            return None
     
     # =========================================================================
     # Call Record Operations
@@ -353,7 +518,7 @@ class FirestoreService:
             return None
         
         try:
-            now = timezone.now()
+            now = server_timestamp()
             call_data = {
                 "callId": call_id,
                 "channelName": channel_name,
@@ -378,19 +543,28 @@ class FirestoreService:
                 "pushSent": False,
             }
             
-            doc_ref = self.db.collection(self.CALLS_COLLECTION).document(call_id)
+            doc_ref = self.calls_collection.document(call_id)
             doc_ref.set(call_data)
             
-            logger.info(f"Created call record: {call_id}")
+            logger.info("Created call record: %s", call_id)
             return call_data
             
         except Exception as e:
-            logger.error(f"Error creating call record: {e}")
+            logger.error("Error creating call record: %s", e)
             return None
 
-    def reserve_push_send(self, call_id: str):
+    def reserve_push_send(self, call_id: str, push_platform: str = ""):
         """
         Attempt to reserve push send for a call (idempotency guard).
+
+        The reservation also records pushPlatform, so a successful send needs
+        no follow-up write; a failed send is rolled back via release_push_send.
+
+        Firestore preconditions cannot test a field value, so this is an
+        optimistic compare-and-set: read pushSent, then update only if the
+        document is unchanged since that read (last_update_time precondition).
+        Two RPCs instead of a begin/read/commit transaction.
+
         Returns:
             True if reserved now,
             False if already reserved/sent,
@@ -400,40 +574,107 @@ class FirestoreService:
             return None
 
         try:
-            from firebase_admin import firestore as fb_firestore
+            from google.api_core.exceptions import FailedPrecondition
+
+            self.invalidate_call_record(call_id)
+            doc_ref = self.calls_collection.document(call_id)
+
+            for _ in range(self.RESERVE_PUSH_ATTEMPTS):
+                snapshot = doc_ref.get(field_paths=["pushSent"])
+                if not snapshot.exists:
+                    return None
+                data = snapshot.to_dict() or {}
+                if data.get("pushSent"):
+                    return False
+                try:
+                    doc_ref.update(
+                        {
+                            "pushSent": True,
+                            "pushPlatform": push_platform,
+                            "pushReservedAt": server_timestamp(),
+                        },
+                        option=self.db.write_option(last_update_time=snapshot.update_time),
+                    )
+                    return True
+                except FailedPrecondition:
+                    # Document changed after our read; re-check pushSent
+                    continue
+
+            logger.warning("Push reservation contended for call %s", call_id)
+            return None
         except Exception as e:
-            logger.error(f"Failed to import firestore for transaction: {e}")
+            logger.error("Error reserving push send: %s", e)
             return None
 
+    async def reserve_push_send_async(self, call_id: str, push_platform: str = ""):
+        """
+        Awaitable reserve_push_send for the async push path.
+
+        Uses the Firestore AsyncClient so the reservation RPCs do not block
+        the event loop; falls back to the sync client on a worker thread.
+        Same return values as reserve_push_send.
+        """
+        db = self._get_async_db()
+        if db is None:
+            return await asyncio.to_thread(self.reserve_push_send, call_id, push_platform)
+
+        self.invalidate_call_record(call_id)
+
         try:
-            doc_ref = self.db.collection(self.CALLS_COLLECTION).document(call_id)
+            from google.api_core.exceptions import FailedPrecondition
+
+            doc_ref = db.collection(self.CALLS_COLLECTION).document(call_id)
 
-            @fb_firestore.transactional
-            def _txn(transaction):
-                snapshot = doc_ref.get(transaction=transaction)
+            for _ in range(self.RESERVE_PUSH_ATTEMPTS):
+                snapshot = await doc_ref.get(field_paths=["pushSent"])
                 if not snapshot.exists:
                     return None
                 data = snapshot.to_dict() or {}
                 if data.get("pushSent"):
                     return False
-                transaction.update(doc_ref, {
-                    "pushSent": True,
-                    "pushReservedAt": timezone.now(),
-                })
-                return True
-
-            return _txn(self.db.transaction())
+                try:
+                    await doc_ref.update(
+                        {
+                            "pushSent": True,
+                            "pushPlatform": push_platform,
+                            "pushReservedAt": server_timestamp(),
+                        },
+                        option=db.write_option(last_update_time=snapshot.update_time),
+                    )
+                    return True
+                except FailedPrecondition:
+                    continue
+
+            logger.warning("Push reservation contended for call %s", call_id)
+            return None
         except Exception as e:
-            logger.error(f"Error reserving push send: {e}")
+            logger.error("Error reserving push send: %s", e)
             return None
     
+    def release_push_send(self, call_id: str, error: str = "") -> bool:
+        """Undo a push reservation after the send failed, so it can be retried"""
+        if not self.db:
+            return False
+
+        try:
+            self.invalidate_call_record(call_id)
+            self.calls_collection.document(call_id).update({
+                "pushSent": False,
+                "pushError": error or "",
+                "updatedAt": server_timestamp(),
+            })
+            return True
+        except Exception as e:
+            logger.error("Error releasing push reservation for %s: %s", call_id, e)
+            return False
+    
     def get_call_record(self, call_id: str) -> Optional[Dict[str, Any]]:
         """Get a call record by ID"""
         if not self.db:
             return None
         
         try:
-            doc_ref = self.db.collection(self.CALLS_COLLECTION).document(call_id)
+            doc_ref = self.calls_collection.document(call_id)
             doc = doc_ref.get()
             
             if doc.exists:
@@ -441,8 +682,41 @@ class FirestoreService:
             return None
             
         except Exception as e:
-            logger.error(f"Error getting call record {call_id}: {e}")
+            logger.error("Error getting call record %s: %s", call_id, e)
             return None
+
+    def get_call_record_cached(self, call_id: str) -> Optional[Dict[str, Any]]:
+        """
+        get_call_record served from a per-process TTL + LRU cache.
+
+        Writes made through this service invalidate the entry; writes from
+        other processes are picked up within CALL_CACHE_TTL_SECONDS. Only
+        use it where a stale status cannot change the outcome (e.g. ahead
+        of a transition_call_status CAS); status reads use get_call_record.
+        """
+        with self._call_cache_lock:
+            entry = self._call_cache.get(call_id)
+            if entry is not None:
+                stored_at, record = entry
+                if time.monotonic() - stored_at < self.CALL_CACHE_TTL_SECONDS:
+                    self._call_cache.move_to_end(call_id)
+                    return dict(record)
+                del self._call_cache[call_id]
+
+        record = self.get_call_record(call_id)
+        if record is not None:
+            with self._call_cache_lock:
+                self._call_cache[call_id] = (time.monotonic(), record)
+                self._call_cache.move_to_end(call_id)
+                while len(self._call_cache) > self.CALL_CACHE_MAX_ENTRIES:
+                    self._call_cache.popitem(last=False)
+            return dict(record)
+        return None
+
+    def invalidate_call_record(self, call_id: str) -> None:
+        """Drop a cached call record so the next lookup re-reads Firestore"""
+        with self._call_cache_lock:
+            self._call_cache.pop(call_id, None)
     
     def update_call_status(
         self,
@@ -460,35 +734,95 @@ class FirestoreService:
             - endedAt: datetime when call ended
             - durationSec: int duration in seconds
             - lastReviewAt: datetime when last reviewed
+
+        Returns the written fields (plus callId), not a re-read document.
         """
         if not self.db:
             return None
         
         try:
-            doc_ref = self.db.collection(self.CALLS_COLLECTION).document(call_id)
-            doc = doc_ref.get()
-            
-            if not doc.exists:
-                logger.warning(f"Call record not found: {call_id}")
-                return None
+            from google.api_core.exceptions import NotFound
+
+            self.invalidate_call_record(call_id)
+            doc_ref = self.calls_collection.document(call_id)
             
             update_data = {
                 "status": status,
             }
             
             # Add optional fields
-            for key in ["answeredAt", "endedAt", "durationSec", "lastReviewAt"]:
+            for key in self.CALL_STATUS_FIELDS:
                 if key in kwargs:
                     update_data[key] = kwargs[key]
             
-            doc_ref.update(update_data)
+            # update() fails with NotFound for a missing doc, so no pre-read
+            try:
+                doc_ref.update(update_data)
+            except NotFound:
+                logger.warning("Call record not found: %s", call_id)
+                return None
             
-            # Return updated document
-            updated_doc = doc_ref.get()
-            return updated_doc.to_dict()
+            return {"callId": call_id, **update_data}
             
         except Exception as e:
-            logger.error(f"Error updating call status: {e}")
+            logger.error("Error updating call status: %s", e)
+            return None
+
+    def transition_call_status(
+        self,
+        call_id: str,
+        from_status: str,
+        to_status: str,
+        **kwargs
+    ) -> Optional[bool]:
+        """
+        Set status to to_status (plus the update_call_status kwargs) only if
+        the call is still in from_status.
+
+        Same optimistic compare-and-set as reserve_push_send: read status,
+        then update with a last_update_time precondition, so two concurrent
+        answers (or an answer racing the missed timeout) cannot both apply.
+
+        Returns:
+            True if the call moved to to_status,
+            False if it was no longer in from_status,
+            None if missing or on error.
+        """
+        if not self.db:
+            return None
+
+        try:
+            from google.api_core.exceptions import FailedPrecondition
+
+            self.invalidate_call_record(call_id)
+            doc_ref = self.calls_collection.document(call_id)
+
+            update_data = {"status": to_status}
+            for key in self.CALL_STATUS_FIELDS:
+                if key in kwargs:
+                    update_data[key] = kwargs[key]
+
+            for _ in range(self.RESERVE_PUSH_ATTEMPTS):
+                snapshot = doc_ref.get(field_paths=["status"])
+                if not snapshot.exists:
+                    logger.warning("Call record not found: %s", call_id)
+                    return None
+                if (snapshot.to_dict() or {}).get("status") != from_status:
+                    return False
+                try:
+                    doc_ref.update(
+                        update_data,
+                        option=self.db.write_option(last_update_time=snapshot.update_time),
+                    )
+                    return True
+                except FailedPrecondition:
+                    # Document changed after our read; re-check status
+                    continue
+
+            logger.warning("Status transition contended for call %s", call_id)
+            return None
+        except Exception as e:
+            logger.error("Error transitioning call status: %s", e)
             return None
     
     def update_push_status(
@@ -502,48 +836,93 @@ class FirestoreService:
             return False
         
         try:
-            doc_ref = self.db.collection(self.CALLS_COLLECTION).document(call_id)
+            self.invalidate_call_record(call_id)
+            doc_ref = self.calls_collection.document(call_id)
             doc_ref.update({
                 "pushSent": push_sent,
                 "pushPlatform": push_platform,
-                "updatedAt": timezone.now(),
+                "updatedAt": server_timestamp(),
             })
             return True
         except Exception as e:
-            logger.error(f"Error updating push status: {e}")
+            logger.error("Error updating push status: %s", e)
             return False
 
     def mark_missed_expired(self, cutoff_time: datetime) -> int:
         """
         Mark pending calls as missed if createdAt <= cutoff_time.
 
+        Matching documents are committed in chunks of BATCH_WRITE_SIZE,
+        with chunks committed in parallel. Each update carries a
+        last_update_time precondition, so a call answered or cancelled
+        after the query is never overwritten; a batch that trips one falls
+        back to per-call transition_call_status.
+
         Returns number of updated documents.
         """
         if not self.db:
             return 0
 
         try:
+            from google.api_core import exceptions as gcp_exceptions
+            from google.api_core.retry import Retry, if_exception_type
+
             query = (
-                self.db.collection(self.CALLS_COLLECTION)
+                self.calls_collection
                 .where("status", "==", "pending")
                 .where("createdAt", "<=", cutoff_time)
+                # Keys-only still returns each document's update_time,
+                # which the per-update preconditions below need
+                .select([])
             )
             docs = list(query.stream())
             if not docs:
                 return 0
-
-            batch = self.db.batch()
-            for doc in docs:
-                batch.update(doc.reference, {
-                    "status": "missed",
-                    "endedAt": timezone.now(),
-                })
-            batch.commit()
-            return len(docs)
         except Exception as e:
-            logger.error(f"Error marking missed calls: {e}")
+            logger.error("Error marking missed calls: %s", e)
             return 0
 
+        retry = Retry(predicate=if_exception_type(
+            gcp_exceptions.Aborted,
+            gcp_exceptions.DeadlineExceeded,
+            gcp_exceptions.ServiceUnavailable,
+        ))
+        ended_at = server_timestamp()
+        chunks = [
+            docs[i:i + self.BATCH_WRITE_SIZE]
+            for i in range(0, len(docs), self.BATCH_WRITE_SIZE)
+        ]
+
+        def _commit_chunk(chunk: List[Any]) -> int:
+            try:
+                batch = self.db.batch()
+                for doc in chunk:
+                    batch.update(
+                        doc.reference,
+                        {"status": "missed", "endedAt": ended_at},
+                        option=self.db.write_option(last_update_time=doc.update_time),
+                    )
+                batch.commit(retry=retry)
+                for doc in chunk:
+                    self.invalidate_call_record(doc.id)
+                return len(chunk)
+            except gcp_exceptions.FailedPrecondition:
+                # A call in this chunk changed since the query and the batch
+                # is all-or-nothing; re-check each call on its own
+                return sum(
+                    1 for doc in chunk
+                    if self.transition_call_status(doc.id, "pending", "missed", endedAt=ended_at)
+                )
+            except Exception as e:
+                logger.error("Error committing missed-call batch (%s docs): %s", len(chunk), e)
+                return 0
+
+        if len(chunks) == 1:
+            return _commit_chunk(chunks[0])
+
+        with ThreadPool(min(self.BATCH_COMMIT_WORKERS, len(chunks))) as pool:
+            return sum(pool.imap_unordered(_commit_chunk, chunks))
+
 
 # Singleton instance
 firestore_service = FirestoreService()
@@ -1,23 +1,135 @@
 import json
 import os
+from functools import lru_cache, wraps
 from typing import Tuple
 
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def json_body(request) -> Tuple[dict, JsonResponse]:
-    try:
-        body = request.body.decode("utf-8") if request.body else "{}"
-        data = json.loads(body)
+json_loads = orjson.loads if orjson else json.loads
+# Types orjson does not handle natively (e.g. Firestore's datetime subclass)
+_json_default = DjangoJSONEncoder().default
+
+
+class BadRequest(Exception):
+    """Malformed request; rendered as a 400 {"error": message} response."""
+
+
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+def parse_json_body(request) -> dict:
+    """
+    Parse the JSON object body once per request (cached on request._json).
+    Raises BadRequest if it is not a JSON object.
+    """
+    data = getattr(request, "_json", None)
+    if data is not None:
+        return data
+    raw = request.body
+    if not raw:
+        data = {}
+    else:
+        try:
+            # Both parsers accept UTF-8 bytes; skip the intermediate str copy
+            data = json_loads(raw)
+        except ValueError as exc:
+            raise BadRequest(f"invalid_json: {exc}")
         if not isinstance(data, dict):
-            raise ValueError("JSON body must be an object")
-        return data, None
-    except (json.JSONDecodeError, ValueError) as exc:
-        return None, JsonResponse({"error": f"invalid_json: {exc}"}, status=400)
+            raise BadRequest("invalid_json: JSON body must be an object")
+    request._json = data
+    return data
+
+
+def json_body(request) -> Tuple[dict, HttpResponse]:
+    try:
+        return parse_json_body(request), None
+    except BadRequest as exc:
+        return None, json_response({"error": str(exc)}, status=400)
+
+
+def allow_methods(*methods):
+    """
+    Answer 405 for any method not listed, before the view (and any body
+    parsing) runs. The allowed set is built once, at decoration time.
+    """
+    allowed = frozenset(methods)
+    allow_header = ", ".join(methods)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in allowed:
+                return method_not_allowed(allow_header)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def method_not_allowed(allow_header: str) -> HttpResponse:
+    """
+    405 with a precomputed Allow header. Built per request rather than shared:
+    CorsMiddleware and the handler write per-request state onto responses.
+    """
+    response = HttpResponse(status=405)
+    response["Allow"] = allow_header
+    return response
+
+
+def with_json_body(view):
+    """Parse the body before the view runs; the view reads request._json."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in BODY_METHODS:
+            try:
+                parse_json_body(request)
+            except BadRequest as exc:
+                return json_response({"error": str(exc)}, status=400)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """JsonResponse equivalent that serializes with orjson when available."""
+    if orjson is None:
+        return JsonResponse(data, status=status, safe=False)
+    return HttpResponse(orjson.dumps(data, default=_json_default), status=status, content_type="application/json")
+
+
+def json_bytes(data) -> bytes:
+    """Serialize a constant payload once (at import) for use with bytes_response."""
+    return json.dumps(data).encode()
+
+
+def bytes_response(body: bytes, status: int = 200) -> HttpResponse:
+    """Response around a pre-serialized JSON body; a fresh object per request."""
+    return HttpResponse(body, status=status, content_type="application/json")
+
+
+@lru_cache(maxsize=None)
+def _error_body(code: str) -> bytes:
+    return json_bytes({"error": code})
+
+
+def error_response(code: str, status: int) -> HttpResponse:
+    """{"error": code} response; the body for each code is serialized once."""
+    return bytes_response(_error_body(code), status)
+
+
+def missing_env(*keys) -> Tuple[str, ...]:
+    """Names of unset env vars; call at import, env does not change at runtime."""
+    return tuple(key for key in keys if not os.environ.get(key))
+
+
+@lru_cache(maxsize=None)
+def _missing_env_body(missing: Tuple[str, ...]) -> bytes:
+    return json_bytes({"error": "missing_env", "missing": list(missing)})
 
 
-def require_env(*keys):
-    missing = [key for key in keys if not os.environ.get(key)]
-    if missing:
-        return JsonResponse({"error": "missing_env", "missing": missing}, status=500)
-    return None
+def missing_env_response(missing: Tuple[str, ...]) -> HttpResponse:
+    return bytes_response(_missing_env_body(missing), 500)
@@ -0,0 +1,81 @@
+"""
+Queue-backed file logging.
+
+Request threads only enqueue records onto LOG_QUEUE; a QueueListener
+thread (started from ApiConfig.ready) writes them to the log files, so
+no request waits on the file lock or a disk write. Message formatting
+still happens on the request thread (QueueHandler.prepare).
+
+Every gunicorn worker appends to the same files, so rotation is left to
+an external tool (logrotate): WatchedFileHandler reopens a file once it
+has been moved away, where per-process size rotation would race.
+"""
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from typing import Dict, List, Optional
+
+LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=10000)
+
+_file_handlers: List[logging.Handler] = []
+_listener: Optional[QueueListener] = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # The writer is behind; drop the record rather than block a request
+            pass
+
+
+def queue_handler(
+    files: Dict[str, str],
+    fmt: str,
+    datefmt: str,
+) -> QueueHandler:
+    """
+    dictConfig factory. files maps each log path to the logger name whose
+    records (including children) it receives.
+    """
+    formatter = logging.Formatter(fmt, datefmt, style="{")
+    _file_handlers.clear()
+    for filename, logger_name in files.items():
+        handler = WatchedFileHandler(filename, encoding="utf-8")
+        handler.setFormatter(formatter)
+        handler.addFilter(logging.Filter(logger_name))
+        _file_handlers.append(handler)
+    return _DroppingQueueHandler(LOG_QUEUE)
+
+
+def start_listener() -> None:
+    global _listener
+    if _listener is not None or not _file_handlers:
+        return
+    _listener = QueueListener(LOG_QUEUE, *_file_handlers, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def stop_listener() -> None:
+    """Drain queued records to the files and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+
+def _restart_in_child() -> None:
+    # The writer thread does not survive fork
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    start_listener()
+
+
+os.register_at_fork(after_in_child=_restart_in_child)
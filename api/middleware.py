@@ -1,10 +1,9 @@
 import logging
 from typing import Optional
 
-from django.http import JsonResponse
-
 from .firebase_service import get_firebase_app
-from .http import json_body
+from .http import error_response, json_body
+from .views.health import health_response
 
 logger = logging.getLogger("api")
 
@@ -49,6 +48,21 @@ SKIP_UID_CHECK_PATHS = {
 }
 
 
+HEALTH_PATHS = {"/api/health", "/api/health/"}
+
+
+class HealthCheckMiddleware:
+    """Answer GET health probes before the rest of the middleware stack runs."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method == "GET" and request.path_info in HEALTH_PATHS:
+            return health_response()
+        return self.get_response(request)
+
+
 class FirebaseAuthMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -63,11 +77,11 @@ class FirebaseAuthMiddleware:
 
         token = _extract_bearer_token(request)
         if not token:
-            return JsonResponse({"error": "missing_authorization"}, status=401)
+            return error_response("missing_authorization", 401)
 
         decoded = _verify_firebase_token(token)
         if decoded is None:
-            return JsonResponse({"error": "invalid_token"}, status=401)
+            return error_response("invalid_token", 401)
 
         request.firebase_uid = decoded.get("uid")
         request.firebase_token = decoded
@@ -81,7 +95,7 @@ class FirebaseAuthMiddleware:
                     body_uid,
                     path,
                 )
-                return JsonResponse({"error": "uid_mismatch"}, status=403)
+                return error_response("uid_mismatch", 403)
 
         return self.get_response(request)
 
@@ -0,0 +1,122 @@
+"""
+Missed-call timeouts driven by one dispatcher thread.
+
+Deadlines live in a heapq min-heap keyed on expiry. cancel() only forgets
+the key's sequence number; the dispatcher drops the stale heap entry when
+it surfaces, so neither schedule nor cancel scans or rebuilds the heap.
+
+Due callbacks run on a small bounded worker pool, so a slow Firestore
+write in one callback does not hold up the next deadline.
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("api")
+
+
+class TimerQueue:
+    """Run callback(key) once per key after a delay; rescheduling a key replaces it."""
+
+    def __init__(self, name: str = "missed-timer", max_workers: int = 8):
+        self._name = name
+        self._max_workers = max_workers
+        self._heap: List[Tuple[float, int, str, Callable[[str], None]]] = []
+        self._entries: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    def schedule(self, key: str, delay_seconds: float, callback: Callable[[str], None]) -> None:
+        deadline = time.monotonic() + delay_seconds
+        with self._cond:
+            self._ensure_dispatcher()
+            seq = next(self._seq)
+            self._entries[key] = seq
+            heapq.heappush(self._heap, (deadline, seq, key, callback))
+            if self._heap[0][1] == seq:
+                # New earliest deadline; wake the dispatcher to re-arm its wait
+                self._cond.notify()
+
+    def cancel(self, key: str) -> bool:
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def queue_depth(self) -> int:
+        """Callbacks that are due but not finished (queued or running)."""
+        with self._cond:
+            return self._in_flight
+
+    def _ensure_dispatcher(self) -> None:
+        # Called with the condition held; a forked child has no dispatcher
+        # and no live pool workers
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix=f"{self._name}-fire",
+        )
+        self._in_flight = 0
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def _next_due(self) -> Tuple[str, Callable[[str], None]]:
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, seq, key, callback = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                if self._entries.get(key) != seq:
+                    # Cancelled or rescheduled since this entry was pushed
+                    continue
+                del self._entries[key]
+                self._in_flight += 1
+                return key, callback
+
+    def _run(self) -> None:
+        while True:
+            key, callback = self._next_due()
+            self._executor.submit(self._fire, key, callback)
+
+    def _fire(self, key: str, callback: Callable[[str], None]) -> None:
+        try:
+            callback(key)
+        except Exception:
+            logger.exception("[TIMER] %s callback failed for %s", self._name, key)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+
+
+missed_timer = TimerQueue()
+
+
+def schedule(call_id: str, delay_seconds: float, callback: Callable[[str], None]) -> None:
+    missed_timer.schedule(call_id, delay_seconds, callback)
+
+
+def cancel(call_id: str) -> bool:
+    return missed_timer.cancel(call_id)
+
+
+def queue_depth() -> int:
+    return missed_timer.queue_depth()
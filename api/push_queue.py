@@ -0,0 +1,143 @@
+"""
+Push delivery off the request path.
+
+Call views enqueue pushes here and respond without waiting on FCM/APNs.
+Sends run on a TimerQueue worker pool; a failed send is retried after a
+Fibonacci backoff (1, 1, 2, 3, 5 s) for up to MAX_ATTEMPTS attempts,
+unless the failure cannot succeed on retry (stale or missing token, push
+not configured).
+"""
+import logging
+from functools import partial
+
+from .firebase_service import firestore_service
+from .missed_timer import TimerQueue
+from .push_service import STALE_TOKEN_ERRORS, PushResult, push_service
+from .utils import run_async
+
+logger = logging.getLogger("api")
+
+MAX_ATTEMPTS = 6
+
+_NON_RETRYABLE_ERRORS = STALE_TOKEN_ERRORS | {"missing_token", "not_configured", "SENDER_ID_MISMATCH"}
+
+push_timer = TimerQueue(name="push-queue", max_workers=4)
+
+
+def backoff_seconds(attempt: int) -> int:
+    """Delay before retrying after the given (1-based) failed attempt."""
+    current, following = 1, 1
+    for _ in range(attempt - 1):
+        current, following = following, current + following
+    return current
+
+
+def _retryable(result: PushResult) -> bool:
+    return result.error_code not in _NON_RETRYABLE_ERRORS and result.error not in _NON_RETRYABLE_ERRORS
+
+
+def _retry(key: str, callback, attempt: int, result: PushResult) -> None:
+    if attempt >= MAX_ATTEMPTS or not _retryable(result):
+        logger.warning(
+            "[PUSH/QUEUE] Giving up: %s after %s attempt(s) error=%s code=%s",
+            key,
+            attempt,
+            result.error,
+            result.error_code,
+        )
+        return
+    delay = backoff_seconds(attempt)
+    logger.info("[PUSH/QUEUE] Retrying %s in %ss (attempt %s)", key, delay, attempt + 1)
+    push_timer.schedule(key, delay, partial(callback, attempt=attempt + 1))
+
+
+async def _reserve_and_send_push(call_id: str, platform: str, **push_kwargs):
+    """Reserve the push and send it on one event loop pass (reserve, result)."""
+    reserve = await firestore_service.reserve_push_send_async(call_id, platform)
+    if reserve is False:
+        return reserve, None
+    result = await push_service.send_incoming_call_push(
+        platform=platform, call_id=call_id, **push_kwargs
+    )
+    return reserve, result
+
+
+def _send_incoming_call(call_id: str, platform: str, push_kwargs: dict, key: str, attempt: int = 1) -> None:
+    # Do not ring a call that was answered, cancelled or timed out meanwhile.
+    # Checked on the first attempt too: push_timer.cancel cannot recall a
+    # send already handed to a worker and waiting in the pool's backlog.
+    record = firestore_service.get_call_record(call_id)
+    if not record or record.get("status") != "pending":
+        logger.info("[PUSH/QUEUE] Dropping push: call=%s is no longer pending (attempt %s)", call_id, attempt)
+        return
+
+    reserve, result = run_async(_reserve_and_send_push(call_id, platform, **push_kwargs))
+    if reserve is False:
+        logger.info("[PUSH/QUEUE] Push already reserved for call=%s", call_id)
+        return
+
+    if result.success:
+        if reserve is None:
+            # Reservation failed, so nothing has recorded the send yet
+            firestore_service.update_push_status(call_id, True, result.platform)
+        logger.info(
+            "[PUSH/QUEUE] Incoming-call push sent: call=%s platform=%s message_id=%s attempt=%s",
+            call_id,
+            result.platform,
+            result.message_id,
+            attempt,
+        )
+        return
+
+    logger.warning(
+        "[PUSH/QUEUE] Incoming-call push failed: call=%s platform=%s error=%s code=%s attempt=%s",
+        call_id,
+        result.platform,
+        result.error,
+        result.error_code,
+        attempt,
+    )
+    if reserve:
+        firestore_service.release_push_send(call_id, result.error_code)
+    _retry(key, partial(_send_incoming_call, call_id, platform, push_kwargs), attempt, result)
+
+
+def _send_call_cancelled(call_id: str, platform: str, push_kwargs: dict, key: str, attempt: int = 1) -> None:
+    result = run_async(push_service.send_call_cancelled_push(
+        platform=platform, call_id=call_id, **push_kwargs
+    ))
+    if result.success:
+        logger.info(
+            "[PUSH/QUEUE] Cancel push sent: call=%s platform=%s message_id=%s attempt=%s",
+            call_id,
+            result.platform,
+            result.message_id,
+            attempt,
+        )
+        return
+
+    logger.warning(
+        "[PUSH/QUEUE] Cancel push failed: call=%s platform=%s error=%s code=%s attempt=%s",
+        call_id,
+        result.platform,
+        result.error,
+        result.error_code,
+        attempt,
+    )
+    _retry(key, partial(_send_call_cancelled, call_id, platform, push_kwargs), attempt, result)
+
+
+def enqueue_incoming_call(call_id: str, platform: str, **push_kwargs) -> None:
+    """Reserve and send the incoming-call push in the background."""
+    push_timer.schedule(
+        f"incoming:{call_id}", 0, partial(_send_incoming_call, call_id, platform, push_kwargs)
+    )
+
+
+def enqueue_call_cancelled(call_id: str, platform: str, **push_kwargs) -> None:
+    """Send the call-cancelled push in the background."""
+    # Supersedes any incoming-call retry still waiting for this call
+    push_timer.cancel(f"incoming:{call_id}")
+    push_timer.schedule(
+        f"cancelled:{call_id}", 0, partial(_send_call_cancelled, call_id, platform, push_kwargs)
+    )
@@ -1,17 +1,24 @@
 """
 Push notification service for iOS (APNs VoIP) and Android (FCM via Firebase Admin SDK)
 """
+import asyncio
+import atexit
 import json
 import logging
 import os
+import threading
 import time
 import jwt
 import httpx
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
+from .utils import close_on_loop, token_fingerprint
 
 logger = logging.getLogger("api")
 
+# Error codes/reasons meaning the stored device token is no longer valid
+STALE_TOKEN_ERRORS = {"UNREGISTERED", "BadDeviceToken", "Unregistered", "410"}
+
 
 @dataclass
 class PushResult:
@@ -23,11 +30,8 @@ class PushResult:
     error_code: Optional[str] = None
 
 
-def _token_fingerprint(token: Optional[str]) -> str:
-    if not token:
-        return "missing"
-    tail = token[-6:] if len(token) >= 6 else token
-    return f"len={len(token)},tail={tail}"
+def _is_stale_token(result: PushResult) -> bool:
+    return result.error_code in STALE_TOKEN_ERRORS or result.error in STALE_TOKEN_ERRORS
 
 
 class APNsVoIPService:
@@ -38,6 +42,9 @@ class APNsVoIPService:
     
     APNS_PRODUCTION_HOST = "api.push.apple.com"
     APNS_SANDBOX_HOST = "api.sandbox.push.apple.com"
+
+    # Apple accepts a provider token for up to 1 hour; refresh well before that
+    TOKEN_TTL_SECONDS = 50 * 60
     
     def __init__(self):
         self.team_id = os.environ.get("APNS_TEAM_ID")
@@ -56,6 +63,19 @@ class APNsVoIPService:
         elif key_content:
             # Handle escaped newlines in env var
             self.private_key = key_content.replace('\\n', '\n')
+
+        # Env doesn't change at runtime; build per-push constants once
+        self.host = self.APNS_SANDBOX_HOST if self.use_sandbox else self.APNS_PRODUCTION_HOST
+        self.topic = f"{self.bundle_id}.voip"  # VoIP push uses .voip suffix on bundle ID
+        self._url_prefix = f"https://{self.host}/3/device/"
+
+        self._cached_token: Optional[str] = None
+        self._cached_token_ts: float = 0.0
+        self._token_lock = threading.Lock()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        atexit.register(self.close)
     
     def is_configured(self) -> bool:
         """Check if APNs is properly configured"""
@@ -67,17 +87,46 @@ class APNsVoIPService:
         ])
     
     def _generate_token(self) -> str:
-        """Generate JWT token for APNs authentication"""
-        headers = {
-            "alg": "ES256",
-            "kid": self.key_id
-        }
-        payload = {
-            "iss": self.team_id,
-            "iat": int(time.time())
-        }
-        return jwt.encode(payload, self.private_key, algorithm="ES256", headers=headers)
+        """Generate JWT token for APNs authentication (reused for TOKEN_TTL_SECONDS)"""
+        with self._token_lock:
+            now = time.time()
+            if self._cached_token and now - self._cached_token_ts < self.TOKEN_TTL_SECONDS:
+                return self._cached_token
+            headers = {
+                "alg": "ES256",
+                "kid": self.key_id
+            }
+            payload = {
+                "iss": self.team_id,
+                "iat": int(now)
+            }
+            self._cached_token = jwt.encode(payload, self.private_key, algorithm="ES256", headers=headers)
+            self._cached_token_ts = now
+            return self._cached_token
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP/2 client so pushes multiplex over one APNs connection.
+        Connections belong to the event loop that opened them, so the client
+        is rebuilt if called from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+            self._client_loop = loop
+        return self._client
+
+    def close(self) -> None:
+        """Close the shared client if its event loop is still usable"""
+        if self._client is None:
+            return
+        close_on_loop(self._client_loop, self._client.aclose)
+        self._client = None
+
     async def send_voip_push(
         self,
         device_token: str,
@@ -103,16 +152,12 @@ class APNsVoIPService:
                 error_code="not_configured"
             )
         
-        host = self.APNS_SANDBOX_HOST if self.use_sandbox else self.APNS_PRODUCTION_HOST
-        url = f"https://{host}/3/device/{device_token}"
-        
-        # VoIP push uses .voip suffix on bundle ID
-        topic = f"{self.bundle_id}.voip"
+        url = self._url_prefix + device_token
 
         expiration = str(int(time.time()) + 10)
         headers = {
             "authorization": f"bearer {self._generate_token()}",
-            "apns-topic": topic,
+            "apns-topic": self.topic,
             "apns-push-type": "voip",
             "apns-priority": "10",  # High priority for VoIP
             "apns-expiration": expiration,
@@ -121,54 +166,53 @@ class APNsVoIPService:
         logger.info(
             "[APNs] VoIP push send start: call_id=%s host=%s topic=%s expiration=%s token=%s payload_keys=%s",
             call_id,
-            host,
-            topic,
+            self.host,
+            self.topic,
             expiration,
-            _token_fingerprint(device_token),
+            token_fingerprint(device_token),
             sorted(payload.keys()),
         )
         
         try:
-            async with httpx.AsyncClient(http2=True) as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30.0
+            client = self._get_client()
+            response = await client.post(
+                url,
+                headers=headers,
+                json=payload,
+            )
+            
+            if response.status_code == 200:
+                apns_id = response.headers.get("apns-id")
+                logger.info(
+                    "[APNs] VoIP push sent successfully: apns_id=%s status=%s",
+                    apns_id,
+                    response.status_code,
+                )
+                return PushResult(
+                    success=True,
+                    platform="ios",
+                    message_id=apns_id
+                )
+            else:
+                try:
+                    error_body = response.json()
+                    reason = error_body.get("reason", "Unknown")
+                except:
+                    reason = response.text or "Unknown error"
+                
+                logger.error(
+                    "[APNs] Push failed: status=%s reason=%s apns_id=%s",
+                    response.status_code,
+                    reason,
+                    response.headers.get("apns-id"),
+                )
+                return PushResult(
+                    success=False,
+                    platform="ios",
+                    error=reason,
+                    error_code=str(response.status_code)
                 )
                 
-                if response.status_code == 200:
-                    apns_id = response.headers.get("apns-id")
-                    logger.info(
-                        "[APNs] VoIP push sent successfully: apns_id=%s status=%s",
-                        apns_id,
-                        response.status_code,
-                    )
-                    return PushResult(
-                        success=True,
-                        platform="ios",
-                        message_id=apns_id
-                    )
-                else:
-                    try:
-                        error_body = response.json()
-                        reason = error_body.get("reason", "Unknown")
-                    except:
-                        reason = response.text or "Unknown error"
-                    
-                    logger.error(
-                        "[APNs] Push failed: status=%s reason=%s apns_id=%s",
-                        response.status_code,
-                        reason,
-                        response.headers.get("apns-id"),
-                    )
-                    return PushResult(
-                        success=False,
-                        platform="ios",
-                        error=reason,
-                        error_code=str(response.status_code)
-                    )
-                    
         except httpx.TimeoutException:
             logger.error("[APNs] Push timeout")
             return PushResult(
@@ -178,7 +222,7 @@ class APNsVoIPService:
                 error_code="timeout"
             )
         except Exception as e:
-            logger.error(f"[APNs] Push exception: {e}")
+            logger.error("[APNs] Push exception: %s", e)
             return PushResult(
                 success=False,
                 platform="ios",
@@ -215,9 +259,9 @@ class FCMService:
                 logger.warning("[FCM] Firebase app not initialized")
                 
         except ImportError as e:
-            logger.error(f"[FCM] Firebase Admin SDK not installed: {e}")
+            logger.error("[FCM] Firebase Admin SDK not installed: %s", e)
         except Exception as e:
-            logger.error(f"[FCM] Initialization error: {e}")
+            logger.error("[FCM] Initialization error: %s", e)
         
         return self._messaging
     
@@ -268,10 +312,10 @@ class FCMService:
                 )
             )
             
-            # Send message (synchronous, but fast)
-            response = messaging.send(message)
+            # messaging.send blocks on HTTP; keep it off the event loop
+            response = await asyncio.to_thread(messaging.send, message)
             
-            logger.info(f"[FCM] Message sent successfully: {response}")
+            logger.info("[FCM] Message sent successfully: %s", response)
             return PushResult(
                 success=True,
                 platform="android",
@@ -279,7 +323,7 @@ class FCMService:
             )
             
         except messaging.UnregisteredError:
-            logger.warning(f"[FCM] Token unregistered: {device_token[:20]}...")
+            logger.warning("[FCM] Token unregistered: %s...", device_token[:20])
             return PushResult(
                 success=False,
                 platform="android",
@@ -295,7 +339,7 @@ class FCMService:
                 error_code="SENDER_ID_MISMATCH"
             )
         except Exception as e:
-            logger.error(f"[FCM] Send error: {e}")
+            logger.error("[FCM] Send error: %s", e)
             return PushResult(
                 success=False,
                 platform="android",
@@ -313,6 +357,15 @@ class PushNotificationService:
         self.apns = APNsVoIPService()
         self.fcm = FCMService()
     
+    @staticmethod
+    def _finish(result: PushResult, receiver_id: Optional[str]) -> PushResult:
+        """Shared send-result handling for every push type."""
+        if receiver_id and _is_stale_token(result):
+            # Force the next lookup to re-read tokens the app may have refreshed
+            from .firebase_service import firestore_service
+            firestore_service.invalidate_user_tokens(receiver_id)
+        return result
+    
     async def send_incoming_call_push(
         self,
         platform: str,
@@ -365,20 +418,22 @@ class PushNotificationService:
                 },
                 **payload
             }
-            return await self.apns.send_voip_push(voip_token, apns_payload, call_id)
+            result = await self.apns.send_voip_push(voip_token, apns_payload, call_id)
         
         elif platform == "android" and fcm_token:
             # Android FCM data message
-            return await self.fcm.send_data_message(fcm_token, payload, call_id)
+            result = await self.fcm.send_data_message(fcm_token, payload, call_id)
         
         else:
             missing = "voipToken" if platform == "ios" else "fcmToken"
-            return PushResult(
+            result = PushResult(
                 success=False,
                 platform=platform,
                 error=f"Missing {missing} for {platform}",
                 error_code="missing_token"
             )
+
+        return self._finish(result, receiver_id)
     
     async def send_call_cancelled_push(
         self,
@@ -386,10 +441,14 @@ class PushNotificationService:
         fcm_token: Optional[str],
         voip_token: Optional[str],
         call_id: str,
-        channel_name: str
+        channel_name: str,
+        receiver_id: Optional[str] = None
     ) -> PushResult:
         """
         Send call cancelled push notification (caller hung up before answer).
+        
+        receiver_id, when given, has its cached tokens dropped if the push
+        reports them stale.
         """
         payload = {
             "type": "call_cancelled",
@@ -404,18 +463,20 @@ class PushNotificationService:
                 },
                 **payload
             }
-            return await self.apns.send_voip_push(voip_token, apns_payload, call_id)
+            result = await self.apns.send_voip_push(voip_token, apns_payload, call_id)
         
         elif platform == "android" and fcm_token:
-            return await self.fcm.send_data_message(fcm_token, payload, call_id)
+            result = await self.fcm.send_data_message(fcm_token, payload, call_id)
         
         else:
-            return PushResult(
+            result = PushResult(
                 success=False,
                 platform=platform,
                 error="No valid token",
                 error_code="missing_token"
             )
+        
+        return self._finish(result, receiver_id)
 
 
 # Singleton instance
@@ -0,0 +1,71 @@
+"""
+Circuit breaker for the local recording service.
+
+After FAILURE_THRESHOLD consecutive transport failures the breaker opens
+and recorder calls fail fast with 503 instead of each waiting out its
+timeout. Once COOLDOWN_SECONDS have passed one probe request is let
+through (half-open); its outcome closes or re-opens the breaker.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger("api")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        # Closed is the hot path: a plain attribute read, no lock
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown_seconds:
+                return False
+            # Let one probe through; restarting the clock means a probe that
+            # never reports back only blocks others for one more cooldown.
+            self.state = HALF_OPEN
+            self.opened_at = time.monotonic()
+            logger.info("[CIRCUIT] %s half-open, probing", self.name)
+            return True
+
+    def record_success(self) -> None:
+        if self.state == CLOSED and not self.failure_count:
+            return
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("[CIRCUIT] %s closed", self.name)
+            self.state = CLOSED
+            self.failure_count = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failure_count += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failure_count >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                logger.warning(
+                    "[CIRCUIT] %s open after %s failures; failing fast for %ss",
+                    self.name,
+                    self.failure_count,
+                    self.cooldown_seconds,
+                )
+
+
+recorder_circuit = CircuitBreaker("recorder-service")
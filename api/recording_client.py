@@ -1,36 +1,119 @@
-import requests
-from django.http import JsonResponse
+import asyncio
+import atexit
+from typing import Optional
+
+import httpx
+from django.http import HttpResponse
 
 from .constants import RECORDER_SERVICE_URL
+from .http import error_response, json_loads, json_response
+from .recorder_circuit import recorder_circuit
+from .utils import close_on_loop
+
+_RECORDER_BASE_URL = RECORDER_SERVICE_URL.rstrip("/")
+_RECORDER_URLS = {
+    endpoint: f"{_RECORDER_BASE_URL}/{endpoint}"
+    for endpoint in ("start", "stop", "sessions", "recordings")
+}
+
+
+def _recorder_url(endpoint: str) -> str:
+    return _RECORDER_URLS.get(endpoint) or f"{_RECORDER_BASE_URL}/{endpoint}"
+
+
+# Shared keep-alive pool so recorder calls skip a TCP handshake per request.
+# Pooled connections belong to the event loop that opened them, so the
+# client is rebuilt if run_async ever hands us a different loop.
+_recorder_client: Optional[httpx.AsyncClient] = None
+_recorder_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_recorder_client() -> httpx.AsyncClient:
+    global _recorder_client, _recorder_client_loop
+    loop = asyncio.get_running_loop()
+    if _recorder_client is None or _recorder_client_loop is not loop:
+        _recorder_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            # Pool settings go on the transport: the client ignores its own
+            # limits/http2 arguments once an explicit transport is given.
+            transport=httpx.AsyncHTTPTransport(
+                http2=False,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                # Retries connection failures only; a sent request is never replayed
+                retries=2,
+            ),
+        )
+        _recorder_client_loop = loop
+    return _recorder_client
+
+
+@atexit.register
+def _close_recorder_client() -> None:
+    if _recorder_client is None:
+        return
+    close_on_loop(_recorder_client_loop, _recorder_client.aclose)
 
 
-def recorder_service_post(
+def _response_body(response: httpx.Response):
+    try:
+        return json_loads(response.content)
+    except ValueError:
+        return {"raw": response.text}
+
+
+def _relay(response: httpx.Response) -> HttpResponse:
+    """Pass a JSON body through byte-for-byte instead of parsing and re-encoding it."""
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return HttpResponse(
+            response.content,
+            status=response.status_code,
+            content_type="application/json",
+        )
+    return json_response(_response_body(response), status=response.status_code)
+
+
+async def recorder_service_get(endpoint: str, timeout: float = 10.0):
+    """Read from local recording service."""
+    if not recorder_circuit.allow_request():
+        return error_response("recorder_service_unavailable", 503)
+    url = _recorder_url(endpoint)
+    try:
+        response = await _get_recorder_client().get(url, timeout=timeout)
+    except httpx.TimeoutException:
+        recorder_circuit.record_failure()
+        return error_response("recorder_service_timeout", 504)
+    except httpx.TransportError:
+        recorder_circuit.record_failure()
+        return error_response("recorder_service_unavailable", 503)
+    recorder_circuit.record_success()
+    return _relay(response)
+
+
+async def recorder_service_post(
     endpoint: str,
     payload: dict,
     allow_conflict_ok: bool = False,
     allow_not_found_ok: bool = False,
 ):
     """Call local recording service."""
-    url = f"{RECORDER_SERVICE_URL.rstrip('/')}/{endpoint}"
+    if not recorder_circuit.allow_request():
+        return error_response("recorder_service_unavailable", 503)
+    url = _recorder_url(endpoint)
     try:
-        response = requests.post(
-            url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-        )
-        try:
-            body = response.json()
-        except ValueError:
-            body = {"raw": response.text}
-        if allow_conflict_ok and response.status_code == 409:
-            body["idempotent"] = True
-            return JsonResponse(body, status=200)
-        if allow_not_found_ok and response.status_code == 404:
-            body["idempotent"] = True
-            return JsonResponse(body, status=200)
-        return JsonResponse(body, status=response.status_code)
-    except requests.exceptions.ConnectionError:
-        return JsonResponse({"error": "recorder_service_unavailable"}, status=503)
-    except requests.exceptions.Timeout:
-        return JsonResponse({"error": "recorder_service_timeout"}, status=504)
+        response = await _get_recorder_client().post(url, json=payload)
+    except httpx.TimeoutException:
+        recorder_circuit.record_failure()
+        return error_response("recorder_service_timeout", 504)
+    except httpx.TransportError:
+        recorder_circuit.record_failure()
+        return error_response("recorder_service_unavailable", 503)
+    recorder_circuit.record_success()
+    if (allow_conflict_ok and response.status_code == 409) or (
+        allow_not_found_ok and response.status_code == 404
+    ):
+        body = _response_body(response)
+        if not isinstance(body, dict):
+            body = {"raw": body}
+        body["idempotent"] = True
+        return json_response(body)
+    return _relay(response)
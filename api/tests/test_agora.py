@@ -0,0 +1,101 @@
+import importlib
+import json
+import time
+from unittest.mock import patch
+
+from django.test import RequestFactory, SimpleTestCase
+
+from agora_token_builder.AccessToken import AccessToken
+
+from api.constants import MAX_TOKEN_EXPIRE_SECONDS
+from api.agora import TOKEN_CACHE_BUCKET_SECONDS, _build, cached_rtc_token
+
+# api.views re-exports the view function under the module's name
+token_view = importlib.import_module("api.views.token")
+
+APP_ID = "970CA35de60c44645bbae8a215061b33"
+APP_CERT = "5CFd2fd1755d40ecb72977518be15d3b"
+
+
+def _reference_token(channel, uid, role, expire_ts, salt, ts):
+    token = AccessToken(APP_ID, APP_CERT, channel, uid)
+    token.salt = salt
+    token.ts = ts
+    token.addPrivilege(1, expire_ts)
+    if role in (0, 1, 101):
+        for privilege in (2, 3, 4):
+            token.addPrivilege(privilege, expire_ts)
+    return token.build()
+
+
+class BuildRtcTokenTest(SimpleTestCase):
+    def test_matches_reference_builder(self):
+        cases = [
+            ("call-1", 2882341273, 1),
+            ("call-1", 2882341273, 2),
+            ("call-1", 0, 1),
+            ("그룹-채널", "user@example.com", 2),
+        ]
+        for channel, uid, role in cases:
+            with self.subTest(channel=channel, uid=uid, role=role):
+                uid_str = "" if uid == 0 else str(uid)
+                self.assertEqual(
+                    _build(APP_ID, APP_CERT, channel, uid_str, role, 1446455471, 1, 1111111),
+                    _reference_token(channel, uid, role, 1446455471, 1, 1111111),
+                )
+
+
+class CachedRtcTokenTest(SimpleTestCase):
+    def setUp(self):
+        # A bucket start ten minutes ahead, so every expiry below is cacheable
+        # and well inside MAX_TOKEN_EXPIRE_SECONDS
+        self.bucket = int(time.time()) + 600
+        self.bucket -= self.bucket % TOKEN_CACHE_BUCKET_SECONDS
+
+    def test_same_bucket_reuses_token(self):
+        first, first_expire = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, self.bucket + 10)
+        second, second_expire = cached_rtc_token(APP_ID, APP_CERT, "c", "7", 1, self.bucket + 50)
+        self.assertEqual(first, second)
+        self.assertEqual(first_expire, self.bucket + 60)
+        self.assertEqual(second_expire, self.bucket + 60)
+
+    def test_new_bucket_mints_new_token(self):
+        first, _ = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, self.bucket + 10)
+        later, later_expire = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, self.bucket + 70)
+        self.assertNotEqual(first, later)
+        self.assertEqual(later_expire, self.bucket + 120)
+
+    def test_expiry_never_rounds_below_request(self):
+        _, expire = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, self.bucket + 1)
+        self.assertGreaterEqual(expire, self.bucket + 1)
+
+    def test_max_expiry_is_not_rounded_past_limit(self):
+        requested = int(time.time()) + MAX_TOKEN_EXPIRE_SECONDS
+        _, expire = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, requested)
+        self.assertLessEqual(expire, requested)
+        self.assertGreater(expire, requested - TOKEN_CACHE_BUCKET_SECONDS)
+        self.assertEqual(expire % TOKEN_CACHE_BUCKET_SECONDS, 0)
+
+    def test_short_lifetime_is_not_cached(self):
+        expire_ts = int(time.time()) + 30
+        first, first_expire = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, expire_ts)
+        second, _ = cached_rtc_token(APP_ID, APP_CERT, "c", 7, 1, expire_ts)
+        self.assertEqual(first_expire, expire_ts)
+        self.assertNotEqual(first, second)
+
+
+class TokenViewTest(SimpleTestCase):
+    def test_short_expire_is_still_valid(self):
+        request = RequestFactory().post(
+            "/token",
+            data=json.dumps({"channel": "c", "uid": 7, "expire": 30}),
+            content_type="application/json",
+        )
+        with patch.object(token_view, "_MISSING_ENV", ()), \
+                patch("api.agora.AGORA_APP_ID", APP_ID), \
+                patch("api.agora.AGORA_APP_CERT", APP_CERT):
+            response = token_view.token(request)
+        body = json.loads(response.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(body["expire_in"], 0)
+        self.assertLessEqual(body["expire_in"], 30)
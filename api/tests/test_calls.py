@@ -0,0 +1,58 @@
+import importlib
+import json
+import threading
+from unittest.mock import patch
+
+from django.test import RequestFactory, SimpleTestCase
+
+# api.views re-exports the view functions under the modules' names
+calls = importlib.import_module("api.views.calls")
+
+
+class CallInviteTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _invite(self, **overrides):
+        payload = {"group_id": "g1", "caller_id": "caller", "receiver_id": "receiver"}
+        payload.update(overrides)
+        request = self.factory.post("/api/calls/invite", data=json.dumps(payload), content_type="application/json")
+        return calls.call_invite(request)
+
+    def test_token_read_overlaps_record_write(self):
+        token_read_started = threading.Event()
+
+        def get_user_tokens(receiver_id):
+            token_read_started.set()
+            return {"exists": False}
+
+        def create_call_record(**kwargs):
+            # Only returns once the token read is in flight alongside it
+            self.assertTrue(token_read_started.wait(timeout=5))
+            return {"callId": kwargs["call_id"]}
+
+        with patch.object(calls, "firestore_service") as service, \
+                patch.object(calls, "missed_timer"):
+            service.is_available.return_value = True
+            service.get_user_tokens.side_effect = get_user_tokens
+            service.create_call_record.side_effect = create_call_record
+
+            response = self._invite()
+
+        self.assertEqual(response.status_code, 200)
+        service.get_user_tokens.assert_called_once_with("receiver")
+
+    def test_record_write_failure_schedules_nothing(self):
+        with patch.object(calls, "firestore_service") as service, \
+                patch.object(calls, "missed_timer") as timer, \
+                patch.object(calls, "push_queue") as queue:
+            service.is_available.return_value = True
+            service.get_user_tokens.return_value = {"exists": True, "platform": "android", "fcmToken": "f1"}
+            service.create_call_record.return_value = None
+
+            response = self._invite()
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(json.loads(response.content)["error"], "failed_to_create_call_record")
+        timer.schedule.assert_not_called()
+        queue.enqueue_incoming_call.assert_not_called()
@@ -0,0 +1,197 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from api.firebase_service import FirestoreService
+
+
+class MarkMissedExpiredTest(SimpleTestCase):
+    def _service_with_refs(self, count):
+        service = FirestoreService()
+        db = MagicMock()
+        docs = [MagicMock(reference=f"ref{i}") for i in range(count)]
+        query = db.collection.return_value.where.return_value.where.return_value.select.return_value
+        query.stream.return_value = iter(docs)
+        service._db = db
+        return service, db
+
+    def test_no_pending_calls(self):
+        service, db = self._service_with_refs(0)
+        self.assertEqual(service.mark_missed_expired(None), 0)
+        db.batch.assert_not_called()
+
+    def test_chunks_over_batch_limit(self):
+        service, db = self._service_with_refs(1000)
+        self.assertEqual(service.mark_missed_expired(None), 1000)
+        # 1000 docs -> 450 + 450 + 100
+        self.assertEqual(db.batch.call_count, 3)
+
+    def test_failed_chunk_not_counted(self):
+        service, db = self._service_with_refs(10)
+        db.batch.return_value.commit.side_effect = RuntimeError("boom")
+        self.assertEqual(service.mark_missed_expired(None), 0)
+
+    def test_updates_are_preconditioned_on_query_time(self):
+        service, db = self._service_with_refs(2)
+        service.mark_missed_expired(None)
+        for call in db.batch.return_value.update.call_args_list:
+            self.assertIs(call.kwargs["option"], db.write_option.return_value)
+        self.assertEqual(db.write_option.call_count, 2)
+        self.assertIn("last_update_time", db.write_option.call_args.kwargs)
+
+    def test_changed_call_falls_back_to_per_call_transition(self):
+        from google.api_core.exceptions import FailedPrecondition
+
+        service, db = self._service_with_refs(3)
+        db.batch.return_value.commit.side_effect = FailedPrecondition("changed")
+        # The second call was answered between the query and the commit
+        with patch.object(service, "transition_call_status", side_effect=[True, False, True]) as transition:
+            self.assertEqual(service.mark_missed_expired(None), 2)
+        self.assertEqual(transition.call_count, 3)
+        self.assertEqual(transition.call_args.args[1:], ("pending", "missed"))
+
+
+class UserTokenCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.service = FirestoreService()
+        self.db = MagicMock()
+        snapshot = self.db.collection.return_value.document.return_value.get.return_value
+        snapshot.exists = True
+        snapshot.to_dict.return_value = {"fcmToken": "f1", "platform": "android"}
+        self.service._db = self.db
+
+    def _reads(self):
+        return self.db.collection.return_value.document.return_value.get.call_count
+
+    def test_second_lookup_served_from_cache(self):
+        first = self.service.get_user_tokens("u1")
+        second = self.service.get_user_tokens("u1")
+        self.assertEqual(first, second)
+        self.assertEqual(first["fcmToken"], "f1")
+        self.assertEqual(self._reads(), 1)
+
+    def test_invalidate_forces_reread(self):
+        self.service.get_user_tokens("u1")
+        self.service.invalidate_user_tokens("u1")
+        self.service.get_user_tokens("u1")
+        self.assertEqual(self._reads(), 2)
+
+    def test_push_token_update_invalidates(self):
+        self.service.get_user_tokens("u1")
+        self.service.update_push_tokens("u1", {"fcmToken": "f2"})
+        self.service.get_user_tokens("u1")
+        self.assertEqual(self._reads(), 2)
+
+
+class CallRecordCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.service = FirestoreService()
+        self.db = MagicMock()
+        snapshot = self.db.collection.return_value.document.return_value.get.return_value
+        snapshot.exists = True
+        snapshot.to_dict.return_value = {"callId": "c1", "status": "pending"}
+        self.service._db = self.db
+
+    def _reads(self):
+        return self.db.collection.return_value.document.return_value.get.call_count
+
+    def test_repeat_lookup_served_from_cache(self):
+        first = self.service.get_call_record_cached("c1")
+        second = self.service.get_call_record_cached("c1")
+        self.assertEqual(first, second)
+        self.assertEqual(self._reads(), 1)
+
+    def test_status_update_invalidates(self):
+        self.service.get_call_record_cached("c1")
+        self.service.update_call_status("c1", "accepted")
+        self.service.get_call_record_cached("c1")
+        self.assertEqual(self._reads(), 2)
+
+
+class ClientPoolTest(SimpleTestCase):
+    def test_collections_rotate_across_pool(self):
+        service = FirestoreService()
+        first, second = MagicMock(), MagicMock()
+        service._db = first
+        service._db_pool = [first, second]
+
+        refs = [service.calls_collection for _ in range(4)]
+
+        self.assertEqual(refs[0], first.collection.return_value)
+        self.assertEqual(refs[1], second.collection.return_value)
+        self.assertEqual(refs[2], refs[0])
+        first.collection.assert_called_once_with("calls")
+
+
+class ReservePushSendTest(SimpleTestCase):
+    def setUp(self):
+        self.service = FirestoreService()
+        self.db = MagicMock()
+        self.doc_ref = self.db.collection.return_value.document.return_value
+        self.snapshot = self.doc_ref.get.return_value
+        self.snapshot.exists = True
+        self.snapshot.to_dict.return_value = {"pushSent": False}
+        self.service._db = self.db
+
+    def test_reserves_unsent_call(self):
+        self.assertTrue(self.service.reserve_push_send("c1"))
+        self.doc_ref.update.assert_called_once()
+
+    def test_already_sent(self):
+        self.snapshot.to_dict.return_value = {"pushSent": True}
+        self.assertFalse(self.service.reserve_push_send("c1"))
+        self.doc_ref.update.assert_not_called()
+
+    def test_retries_when_document_changed(self):
+        from google.api_core.exceptions import FailedPrecondition
+
+        self.doc_ref.update.side_effect = [FailedPrecondition("stale"), None]
+        self.assertTrue(self.service.reserve_push_send("c1"))
+        self.assertEqual(self.doc_ref.get.call_count, 2)
+
+    def test_async_reserve_uses_async_client(self):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+
+        async_db = MagicMock()
+        doc_ref = async_db.collection.return_value.document.return_value
+        snapshot = MagicMock(exists=True)
+        snapshot.to_dict.return_value = {"pushSent": False}
+        doc_ref.get = AsyncMock(return_value=snapshot)
+        doc_ref.update = AsyncMock()
+
+        with patch("api.firebase_service.create_async_firestore", return_value=async_db):
+            reserved = asyncio.run(self.service.reserve_push_send_async("c1", "ios"))
+
+        self.assertTrue(reserved)
+        doc_ref.update.assert_awaited_once()
+        self.doc_ref.update.assert_not_called()
+
+
+class TransitionCallStatusTest(SimpleTestCase):
+    def setUp(self):
+        self.service = FirestoreService()
+        self.db = MagicMock()
+        self.doc_ref = self.db.collection.return_value.document.return_value
+        self.snapshot = self.doc_ref.get.return_value
+        self.snapshot.exists = True
+        self.snapshot.to_dict.return_value = {"status": "pending"}
+        self.service._db = self.db
+
+    def test_transitions_from_expected_status(self):
+        self.assertTrue(self.service.transition_call_status("c1", "pending", "accepted", answeredAt="t"))
+        data = self.doc_ref.update.call_args.args[0]
+        self.assertEqual(data, {"status": "accepted", "answeredAt": "t"})
+
+    def test_other_status_is_left_alone(self):
+        self.snapshot.to_dict.return_value = {"status": "cancelled"}
+        self.assertFalse(self.service.transition_call_status("c1", "pending", "accepted"))
+        self.doc_ref.update.assert_not_called()
+
+    def test_rechecks_status_when_document_changed(self):
+        from google.api_core.exceptions import FailedPrecondition
+
+        self.doc_ref.update.side_effect = FailedPrecondition("stale")
+        self.snapshot.to_dict.side_effect = [{"status": "pending"}, {"status": "missed"}]
+        self.assertFalse(self.service.transition_call_status("c1", "pending", "accepted"))
+        self.assertEqual(self.doc_ref.get.call_count, 2)
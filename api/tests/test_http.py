@@ -0,0 +1,58 @@
+import json
+
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from api.http import BadRequest, allow_methods, parse_json_body, with_json_body
+
+
+class ParseJsonBodyTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _post(self, body: bytes):
+        return self.factory.post("/x", data=body, content_type="application/json")
+
+    def test_parses_once_per_request(self):
+        request = self._post(b'{"a": 1}')
+        first = parse_json_body(request)
+        self.assertIs(parse_json_body(request), first)
+        self.assertEqual(first, {"a": 1})
+
+    def test_empty_body_is_empty_object(self):
+        self.assertEqual(parse_json_body(self._post(b"")), {})
+
+    def test_rejects_non_object(self):
+        with self.assertRaises(BadRequest):
+            parse_json_body(self._post(b"[1, 2]"))
+
+    def test_decorator_returns_400(self):
+        view = with_json_body(lambda request: JsonResponse(request._json))
+
+        bad = view(self._post(b"{oops"))
+        self.assertEqual(bad.status_code, 400)
+        self.assertTrue(json.loads(bad.content)["error"].startswith("invalid_json"))
+
+        ok = view(self._post(b'{"a": 1}'))
+        self.assertEqual(json.loads(ok.content), {"a": 1})
+
+
+class AllowMethodsTest(SimpleTestCase):
+    def test_rejects_other_methods_before_view(self):
+        calls = []
+        view = allow_methods("POST")(lambda request: calls.append(request) or JsonResponse({}))
+        factory = RequestFactory()
+
+        response = view(factory.get("/x"))
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response["Allow"], "POST")
+        self.assertEqual(calls, [])
+        self.assertEqual(view(factory.post("/x")).status_code, 200)
+
+
+class HealthCheckTest(SimpleTestCase):
+    def test_health_response_carries_cors_headers(self):
+        response = self.client.get("/api/health", HTTP_ORIGIN="https://memory-harbor.delight-house.org")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "https://memory-harbor.delight-house.org")
@@ -0,0 +1,44 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from api.missed_timer import TimerQueue
+
+
+class TimerQueueTest(SimpleTestCase):
+    def setUp(self):
+        self.timers = TimerQueue(name="test-timer")
+        self.fired = []
+        self.done = threading.Event()
+
+    def _callback(self, key):
+        self.fired.append(key)
+        self.done.set()
+
+    def test_fires_in_deadline_order(self):
+        self.timers.schedule("late", 0.10, self._callback)
+        self.timers.schedule("early", 0.02, lambda key: self.fired.append(key))
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.fired, ["early", "late"])
+        self.assertEqual(self.timers.pending(), 0)
+
+    def test_cancelled_timer_does_not_fire(self):
+        self.timers.schedule("c1", 0.02, self._callback)
+        self.assertTrue(self.timers.cancel("c1"))
+        self.timers.schedule("c2", 0.05, self._callback)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.fired, ["c2"])
+
+    def test_reschedule_replaces_previous_deadline(self):
+        self.timers.schedule("c1", 0.02, lambda key: self.fired.append("stale"))
+        self.timers.schedule("c1", 0.05, self._callback)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.fired, ["c1"])
+
+    def test_slow_callback_does_not_delay_next(self):
+        release = threading.Event()
+        self.timers.schedule("slow", 0.01, lambda key: release.wait(2))
+        self.timers.schedule("fast", 0.03, self._callback)
+        self.assertTrue(self.done.wait(1))
+        self.assertGreaterEqual(self.timers.queue_depth(), 1)
+        release.set()
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase
+
+from api import push_queue
+from api.push_service import PushResult
+
+
+class BackoffTest(SimpleTestCase):
+    def test_fibonacci_delays(self):
+        self.assertEqual([push_queue.backoff_seconds(n) for n in range(1, 6)], [1, 1, 2, 3, 5])
+
+
+class SendCancelledRetryTest(SimpleTestCase):
+    push_kwargs = {"fcm_token": "f1", "voip_token": None, "channel_name": "c1"}
+
+    def _send(self, result, attempt=1):
+        def run_async(coro):
+            coro.close()
+            return result
+
+        with patch.object(push_queue, "run_async", side_effect=run_async), \
+                patch.object(push_queue.push_timer, "schedule") as schedule:
+            push_queue._send_call_cancelled("c1", "android", self.push_kwargs, "cancelled:c1", attempt=attempt)
+        return schedule
+
+    def test_transient_failure_is_rescheduled(self):
+        schedule = self._send(PushResult(success=False, platform="android", error_code="exception"))
+        key, delay, callback = schedule.call_args.args
+        self.assertEqual((key, delay), ("cancelled:c1", 1))
+        self.assertEqual(callback.keywords, {"attempt": 2})
+
+    def test_stale_token_is_not_retried(self):
+        schedule = self._send(PushResult(success=False, platform="android", error_code="UNREGISTERED"))
+        schedule.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self):
+        result = PushResult(success=False, platform="android", error_code="exception")
+        schedule = self._send(result, attempt=push_queue.MAX_ATTEMPTS)
+        schedule.assert_not_called()
+
+
+class SendIncomingCallTest(SimpleTestCase):
+    push_kwargs = {"fcm_token": "f1", "voip_token": None, "channel_name": "c1"}
+
+    def _send(self, reserve=True, result=None, attempt=1, status="pending"):
+        with patch.object(push_queue, "firestore_service") as service, \
+                patch.object(push_queue, "push_service") as push, \
+                patch.object(push_queue.push_timer, "schedule") as schedule:
+            service.reserve_push_send_async = AsyncMock(return_value=reserve)
+            service.get_call_record.return_value = {"status": status}
+            push.send_incoming_call_push = AsyncMock(return_value=result)
+            push_queue._send_incoming_call("c1", "android", self.push_kwargs, "incoming:c1", attempt=attempt)
+        return service, push, schedule
+
+    def test_already_reserved_is_not_sent(self):
+        service, push, schedule = self._send(reserve=False)
+        push.send_incoming_call_push.assert_not_called()
+        service.release_push_send.assert_not_called()
+        schedule.assert_not_called()
+
+    def test_success_keeps_reservation(self):
+        result = PushResult(success=True, platform="android", message_id="m1")
+        service, push, schedule = self._send(result=result)
+        push.send_incoming_call_push.assert_awaited_once()
+        service.release_push_send.assert_not_called()
+        service.update_push_status.assert_not_called()
+        schedule.assert_not_called()
+
+    def test_success_without_reservation_records_push(self):
+        result = PushResult(success=True, platform="android", message_id="m1")
+        service, _, _ = self._send(reserve=None, result=result)
+        service.update_push_status.assert_called_once_with("c1", True, "android")
+
+    def test_failure_releases_reservation_and_retries(self):
+        result = PushResult(success=False, platform="android", error="timeout", error_code="exception")
+        service, _, schedule = self._send(result=result)
+        service.release_push_send.assert_called_once_with("c1", "exception")
+        key, delay, callback = schedule.call_args.args
+        self.assertEqual((key, delay), ("incoming:c1", 1))
+        self.assertEqual(callback.keywords, {"attempt": 2})
+
+    def test_retry_delay_follows_fibonacci(self):
+        result = PushResult(success=False, platform="android", error_code="exception")
+        _, _, schedule = self._send(result=result, attempt=4)
+        _, delay, callback = schedule.call_args.args
+        self.assertEqual(delay, 3)
+        self.assertEqual(callback.keywords, {"attempt": 5})
+
+    def test_retry_dropped_once_call_is_not_pending(self):
+        service, push, schedule = self._send(attempt=2, status="accepted")
+        service.reserve_push_send_async.assert_not_called()
+        push.send_incoming_call_push.assert_not_called()
+        schedule.assert_not_called()
+
+    def test_first_attempt_dropped_once_call_is_not_pending(self):
+        service, push, schedule = self._send(status="cancelled")
+        service.reserve_push_send_async.assert_not_called()
+        push.send_incoming_call_push.assert_not_called()
+        schedule.assert_not_called()
+
+    def test_cancel_before_first_attempt_runs(self):
+        record = {"status": "pending"}
+        with patch.object(push_queue, "firestore_service") as service, \
+                patch.object(push_queue, "push_service") as push, \
+                patch.object(push_queue.push_timer, "schedule") as schedule:
+            service.get_call_record.side_effect = lambda call_id: dict(record)
+            service.reserve_push_send_async = AsyncMock(return_value=True)
+            push.send_incoming_call_push = AsyncMock()
+
+            push_queue.enqueue_incoming_call("c1", "android", **self.push_kwargs)
+            # The incoming send is already with a worker, queued behind others
+            incoming_send = schedule.call_args.args[2]
+            record["status"] = "cancelled"
+            push_queue.enqueue_call_cancelled("c1", "android", fcm_token="f1")
+            incoming_send("incoming:c1")
+
+        service.reserve_push_send_async.assert_not_called()
+        push.send_incoming_call_push.assert_not_called()
@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase
+
+from api.push_service import PushNotificationService, PushResult
+
+STALE = PushResult(success=False, platform="android", error="Token unregistered", error_code="UNREGISTERED")
+
+
+class StaleTokenInvalidationTest(SimpleTestCase):
+    def setUp(self):
+        self.service = PushNotificationService()
+        self.service.fcm.send_data_message = AsyncMock(return_value=STALE)
+
+    def _run(self, coro):
+        with patch("api.firebase_service.firestore_service") as firestore:
+            result = asyncio.run(coro)
+        return result, firestore
+
+    def test_incoming_call_push_invalidates_stale_tokens(self):
+        _, firestore = self._run(self.service.send_incoming_call_push(
+            platform="android", fcm_token="f1", voip_token=None, call_id="c1",
+            channel_name="ch", caller_name="A", group_id="g1", receiver_id="r1", caller_id="u1",
+        ))
+        firestore.invalidate_user_tokens.assert_called_once_with("r1")
+
+    def test_cancel_push_invalidates_stale_tokens(self):
+        _, firestore = self._run(self.service.send_call_cancelled_push(
+            platform="android", fcm_token="f1", voip_token=None, call_id="c1",
+            channel_name="ch", receiver_id="r1",
+        ))
+        firestore.invalidate_user_tokens.assert_called_once_with("r1")
+
+    def test_successful_push_keeps_tokens(self):
+        self.service.fcm.send_data_message = AsyncMock(
+            return_value=PushResult(success=True, platform="android", message_id="m1")
+        )
+        _, firestore = self._run(self.service.send_call_cancelled_push(
+            platform="android", fcm_token="f1", voip_token=None, call_id="c1",
+            channel_name="ch", receiver_id="r1",
+        ))
+        firestore.invalidate_user_tokens.assert_not_called()
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from api.recorder_circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("test", failure_threshold=3, cooldown_seconds=30.0)
+
+    def _trip(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_single_probe_after_cooldown(self):
+        self._trip()
+        later = self.breaker.opened_at + 31
+        with patch("api.recorder_circuit.time.monotonic", return_value=later):
+            self.assertTrue(self.breaker.allow_request())
+            self.assertEqual(self.breaker.state, HALF_OPEN)
+            self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self._trip()
+        with patch("api.recorder_circuit.time.monotonic", return_value=self.breaker.opened_at + 31):
+            self.breaker.allow_request()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
@@ -0,0 +1,57 @@
+import json
+from unittest.mock import patch
+
+import httpx
+from django.test import SimpleTestCase
+
+from api import recording_client
+from api.utils import run_async
+
+
+def _client(status, content, content_type="application/json"):
+    def handler(request):
+        return httpx.Response(status, content=content, headers={"content-type": content_type})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class RecorderServicePostTest(SimpleTestCase):
+    def _post(self, client, **kwargs):
+        with patch.object(recording_client, "_get_recorder_client", return_value=client):
+            return run_async(recording_client.recorder_service_post("start", {}, **kwargs))
+
+    def test_json_body_relayed_verbatim(self):
+        body = b'{"sid":"s1","ok":true}'
+        response = self._post(_client(201, body))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.content, body)
+
+    def test_conflict_marked_idempotent(self):
+        response = self._post(_client(409, b'{"sid":"s1"}'), allow_conflict_ok=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {"sid": "s1", "idempotent": True})
+
+    def test_open_circuit_fails_fast(self):
+        breaker = recording_client.recorder_circuit
+        with patch.object(breaker, "allow_request", return_value=False):
+            response = self._post(_client(201, b"{}"))
+        self.assertEqual(response.status_code, 503)
+
+    def test_non_json_wrapped_as_raw(self):
+        response = self._post(_client(502, b"Bad Gateway", "text/plain"))
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(json.loads(response.content), {"raw": "Bad Gateway"})
+
+
+class RecorderClientTest(SimpleTestCase):
+    def test_pool_limits_are_passed_to_the_transport(self):
+        # The client drops its own limits= once given an explicit transport
+        async def build():
+            return recording_client._get_recorder_client()
+
+        with patch.object(recording_client, "_recorder_client", None), \
+                patch.object(httpx, "AsyncHTTPTransport", wraps=httpx.AsyncHTTPTransport) as transport:
+            run_async(build())
+
+        limits = transport.call_args.kwargs["limits"]
+        self.assertEqual(limits.max_connections, 100)
+        self.assertEqual(limits.max_keepalive_connections, 20)
@@ -0,0 +1,46 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from api.constants import DEFAULT_TOKEN_EXPIRE_SECONDS, MAX_TOKEN_EXPIRE_SECONDS, ROLE_PUBLISHER, ROLE_SUBSCRIBER
+from api.utils import clamp_expire, parse_role, run_async
+
+
+class ParseRoleTest(SimpleTestCase):
+    def test_names_any_case(self):
+        self.assertEqual(parse_role("host"), ROLE_PUBLISHER)
+        self.assertEqual(parse_role("Publisher"), ROLE_PUBLISHER)
+        self.assertEqual(parse_role("AuDiEnCe"), ROLE_SUBSCRIBER)
+        self.assertIsNone(parse_role("viewer"))
+
+    def test_ints_and_none(self):
+        self.assertEqual(parse_role(None), ROLE_SUBSCRIBER)
+        self.assertEqual(parse_role(1), ROLE_PUBLISHER)
+        self.assertEqual(parse_role(7), ROLE_SUBSCRIBER)
+
+
+class ClampExpireTest(SimpleTestCase):
+    def test_int_and_string_inputs(self):
+        self.assertEqual(clamp_expire(60), 60)
+        self.assertEqual(clamp_expire("60"), 60)
+        self.assertEqual(clamp_expire(10**9), MAX_TOKEN_EXPIRE_SECONDS)
+
+    def test_invalid_falls_back_to_default(self):
+        for value in (0, -5, None, "soon"):
+            with self.subTest(value=value):
+                self.assertEqual(clamp_expire(value), DEFAULT_TOKEN_EXPIRE_SECONDS)
+
+
+class RunAsyncTest(SimpleTestCase):
+    def test_reuses_background_loop(self):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        self.assertIs(run_async(current_loop()), run_async(current_loop()))
+
+    def test_propagates_exceptions(self):
+        async def boom():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run_async(boom())
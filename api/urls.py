@@ -1,5 +1,8 @@
-from django.urls import path
+from django.urls import path, register_converter
 from . import views
+from .converters import CallIdConverter
+
+register_converter(CallIdConverter, "callid")
 
 urlpatterns = [
     # Health check
@@ -22,7 +25,7 @@ urlpatterns = [
     path("call/missed", views.call_missed, name="call_missed"),
     path("call/timeout/sweep", views.call_timeout_sweep, name="call_timeout_sweep"),
     path("call/end", views.call_end, name="call_end"),
-    path("call/status/<str:call_id>", views.call_status, name="call_status"),
+    path("call/status/<callid:call_id>", views.call_status, name="call_status"),
 
     # User management
     path("user/exists", views.user_exists, name="user_exists"),
@@ -1,26 +1,48 @@
 import asyncio
+import os
+import threading
 from datetime import datetime
+from typing import Optional
 
 from django.utils import timezone
 
 from .constants import DEFAULT_TOKEN_EXPIRE_SECONDS, MAX_TOKEN_EXPIRE_SECONDS, ROLE_PUBLISHER, ROLE_SUBSCRIBER
 
 
+_ROLE_NAMES = {
+    "publisher": ROLE_PUBLISHER,
+    "host": ROLE_PUBLISHER,
+    "broadcaster": ROLE_PUBLISHER,
+    "subscriber": ROLE_SUBSCRIBER,
+    "audience": ROLE_SUBSCRIBER,
+}
+# Pre-expanded common casings so the usual request needs no .lower()
+_ROLE_MAP = {
+    variant: role
+    for name, role in _ROLE_NAMES.items()
+    for variant in (name, name.capitalize(), name.upper())
+}
+
+
 def parse_role(value):
     if value is None:
         return ROLE_SUBSCRIBER
+    if isinstance(value, str):
+        role = _ROLE_MAP.get(value)
+        if role is None:
+            role = _ROLE_NAMES.get(value.lower())
+        return role
     if isinstance(value, int):
         return ROLE_PUBLISHER if value == ROLE_PUBLISHER else ROLE_SUBSCRIBER
-    if isinstance(value, str):
-        value = value.lower()
-        if value in {"publisher", "host", "broadcaster"}:
-            return ROLE_PUBLISHER
-        if value in {"subscriber", "audience"}:
-            return ROLE_SUBSCRIBER
     return None
 
 
 def clamp_expire(expire):
+    # JSON numbers arrive as int; type() check also keeps bools off this path
+    if type(expire) is int:
+        if expire <= 0:
+            return DEFAULT_TOKEN_EXPIRE_SECONDS
+        return min(expire, MAX_TOKEN_EXPIRE_SECONDS)
     try:
         expire = int(expire)
     except (TypeError, ValueError):
@@ -30,14 +52,52 @@ def clamp_expire(expire):
     return min(expire, MAX_TOKEN_EXPIRE_SECONDS)
 
 
+# One long-lived event loop on a daemon thread serves every run_async call,
+# so loop-bound async clients (httpx pools, Firestore AsyncClient) are built
+# once per process instead of per loop. Restarted after fork.
+_loop: asyncio.AbstractEventLoop = None
+_loop_pid: int = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    if _loop is not None and _loop_pid == os.getpid():
+        return _loop
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="run-async-loop", daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+    return _loop
+
+
 def run_async(coro):
     """Helper to run async code in sync Django views."""
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(coro)
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def close_on_loop(loop, coro_fn, timeout: float = 5.0) -> None:
+    """Run coro_fn() on the loop an async client belongs to (atexit cleanup)."""
+    if loop is None or loop.is_closed():
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(coro_fn(), loop).result(timeout)
+    else:
+        loop.run_until_complete(coro_fn())
+
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Loggable summary of a push token (length + tail) without the secret."""
+    if not token:
+        return "missing"
+    tail = token[-6:] if len(token) >= 6 else token
+    return f"len={len(token)},tail={tail}"
+
+
+def firebase_uid(request) -> Optional[str]:
+    """UID set on the request by FirebaseAuthMiddleware (None if unauthenticated)."""
+    return getattr(request, "firebase_uid", None)
 
 
 def generate_channel_name(call_id: str) -> str:
@@ -45,13 +105,17 @@ def generate_channel_name(call_id: str) -> str:
     return call_id
 
 
+# TIME_ZONE is fixed in settings and nothing calls timezone.activate()
+CURRENT_TZ = timezone.get_current_timezone()
+
+
 def normalize_datetime(value):
     if value is None:
         return None
     if hasattr(value, "timestamp"):
-        return datetime.fromtimestamp(value.timestamp(), tz=timezone.get_current_timezone())
+        return datetime.fromtimestamp(value.timestamp(), tz=CURRENT_TZ)
     if isinstance(value, datetime):
         if timezone.is_naive(value):
-            return timezone.make_aware(value, timezone.get_current_timezone())
-        return timezone.localtime(value)
+            return timezone.make_aware(value, CURRENT_TZ)
+        return value.astimezone(CURRENT_TZ)
     return None
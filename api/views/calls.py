@@ -1,74 +1,74 @@
 import logging
-import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from django.http import JsonResponse, HttpResponseNotAllowed
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 
+from .. import missed_timer, push_queue
 from ..constants import MISSED_TIMEOUT_SECONDS
-from ..firebase_service import firestore_service
-from ..http import json_body
-from ..push_service import push_service
-from ..utils import run_async, generate_channel_name, normalize_datetime
+from ..firebase_service import firestore_service, server_timestamp
+from ..http import allow_methods, bytes_response, error_response, json_body, json_bytes, json_response
+from ..utils import CURRENT_TZ, generate_channel_name, normalize_datetime, token_fingerprint
 
 logger = logging.getLogger("api")
 
-_missed_timers = {}
-_missed_timers_lock = threading.Lock()
+# Reads the receiver's push tokens while the invite writes the call record
+_token_read_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="invite-tokens")
 
-def _token_fingerprint(token: str) -> str:
-    if not token:
-        return "missing"
-    tail = token[-6:] if len(token) >= 6 else token
-    return f"len={len(token)},tail={tail}"
+_INVITE_MISSING_FIELDS = json_bytes({
+    "error": "missing_fields",
+    "required": ["group_id", "caller_id", "receiver_id"],
+})
+_FIRESTORE_UNAVAILABLE = json_bytes({
+    "error": "firestore_unavailable",
+    "message": "Firebase Firestore is not configured",
+})
+_INVALID_ACTION = json_bytes({"error": "invalid_action", "valid": ["accept", "decline"]})
+
+
+def _load_call_record(call_id: str, expected_status: str):
+    """
+    Call record for a status-gated transition. A stale cached copy cannot
+    change the outcome: the transition itself is a compare-and-set on the
+    live status, and a lost CAS re-reads uncached. Statuses only move
+    forward, so a cached copy in another status may predate a transition
+    made by another worker; re-read it before trusting the mismatch.
+    """
+    call_record = firestore_service.get_call_record_cached(call_id)
+    if call_record and call_record.get("status") != expected_status:
+        firestore_service.invalidate_call_record(call_id)
+        call_record = firestore_service.get_call_record_cached(call_id)
+    return call_record
+
+
+def _mark_missed_if_pending(call_id: str) -> None:
+    firestore_service.transition_call_status(call_id, "pending", "missed", endedAt=server_timestamp())
 
 
 def _schedule_missed_timeout(call_id: str, timeout_seconds: int = MISSED_TIMEOUT_SECONDS) -> None:
-    def _timeout_handler():
-        try:
-            call_record = firestore_service.get_call_record(call_id)
-            if not call_record or call_record.get("status") != "pending":
-                return
-            firestore_service.update_call_status(call_id, "missed", endedAt=timezone.now())
-        finally:
-            with _missed_timers_lock:
-                _missed_timers.pop(call_id, None)
-
-    with _missed_timers_lock:
-        existing = _missed_timers.get(call_id)
-        if existing:
-            existing.cancel()
-        timer = threading.Timer(timeout_seconds, _timeout_handler)
-        timer.daemon = True
-        _missed_timers[call_id] = timer
-        timer.start()
+    missed_timer.schedule(call_id, timeout_seconds, _mark_missed_if_pending)
 
 
 def _cancel_missed_timeout(call_id: str) -> None:
-    with _missed_timers_lock:
-        timer = _missed_timers.pop(call_id, None)
-        if timer:
-            timer.cancel()
+    missed_timer.cancel(call_id)
 
 
 @csrf_exempt
+@allow_methods("POST")
 def call_invite(request):
     """
     Initiate a call - generates channel name, creates call record in Firestore,
     and sends push notification to receiver.
     """
-    logger.info(f"[CALL/INVITE] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/INVITE] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
         return error
 
-    logger.info(f"[CALL/INVITE] Request data: {data}")
+    logger.info("[CALL/INVITE] Request data: %s", data)
 
     group_id = data.get("group_id")
     caller_id = data.get("caller_id")
@@ -78,20 +78,17 @@ def call_invite(request):
     receiver_name_snapshot = data.get("receiver_name_snapshot")
 
     if not all([group_id, caller_id, receiver_id]):
-        return JsonResponse({
-            "error": "missing_fields",
-            "required": ["group_id", "caller_id", "receiver_id"],
-        }, status=400)
+        return bytes_response(_INVITE_MISSING_FIELDS, 400)
 
     if not firestore_service.is_available():
-        return JsonResponse({
-            "error": "firestore_unavailable",
-            "message": "Firebase Firestore is not configured",
-        }, status=503)
+        return bytes_response(_FIRESTORE_UNAVAILABLE, 503)
 
     call_id = str(uuid.uuid4())
     channel_name = generate_channel_name(call_id)
 
+    # The token read does not depend on the record, so overlap the two RPCs
+    tokens_future = _token_read_executor.submit(firestore_service.get_user_tokens, receiver_id)
+
     call_record = firestore_service.create_call_record(
         call_id=call_id,
         channel_name=channel_name,
@@ -104,18 +101,15 @@ def call_invite(request):
     )
 
     if not call_record:
-        return JsonResponse({
-            "error": "failed_to_create_call_record",
-        }, status=500)
+        return error_response("failed_to_create_call_record", 500)
 
-    logger.info(f"[CALL/INVITE] Created call record: {call_id}, channel={channel_name}")
+    logger.info("[CALL/INVITE] Created call record: %s, channel=%s", call_id, channel_name)
 
     _schedule_missed_timeout(call_id, MISSED_TIMEOUT_SECONDS)
 
-    user_tokens = firestore_service.get_user_tokens(receiver_id)
+    user_tokens = tokens_future.result()
 
-    push_sent = False
-    push_platform = ""
+    push_queued = False
     push_error = None
 
     if user_tokens and user_tokens.get("exists"):
@@ -126,164 +120,152 @@ def call_invite(request):
             "[CALL/INVITE] Tokens: receiver=%s platform=%s fcm=%s voip=%s",
             receiver_id,
             platform,
-            _token_fingerprint(fcm_token),
-            _token_fingerprint(voip_token),
+            token_fingerprint(fcm_token),
+            token_fingerprint(voip_token),
         )
 
-        reserve = firestore_service.reserve_push_send(call_id)
-        if reserve is False:
-            push_sent = True
-            push_error = "already_sent"
-            logger.info(f"[CALL/INVITE] Push already reserved for call={call_id}")
-        else:
-            result = run_async(push_service.send_incoming_call_push(
-                platform=platform,
-                fcm_token=fcm_token,
-                voip_token=voip_token,
-                call_id=call_id,
-                channel_name=channel_name,
-                caller_name=caller_name,
-                group_id=group_id,
-                receiver_id=receiver_id,
-                caller_id=caller_id,
-            ))
-
-            if result.success:
-                push_sent = True
-                push_platform = result.platform
-                firestore_service.update_push_status(call_id, True, result.platform)
-                logger.info(
-                    "[CALL/INVITE] Push success: call=%s platform=%s message_id=%s",
-                    call_id,
-                    result.platform,
-                    result.message_id,
-                )
-            else:
-                push_error = result.error
-                logger.warning(
-                    "[CALL/INVITE] Push failed: call=%s platform=%s error=%s code=%s",
-                    call_id,
-                    result.platform,
-                    result.error,
-                    result.error_code,
-                )
+        push_queue.enqueue_incoming_call(
+            call_id,
+            platform,
+            fcm_token=fcm_token,
+            voip_token=voip_token,
+            channel_name=channel_name,
+            caller_name=caller_name,
+            group_id=group_id,
+            receiver_id=receiver_id,
+            caller_id=caller_id,
+        )
+        push_queued = True
     else:
         if user_tokens is None:
             push_error = "firestore_error"
         else:
             push_error = "user_not_found"
-        logger.warning(f"[CALL/INVITE] No tokens found for receiver={receiver_id}")
+        logger.warning("[CALL/INVITE] No tokens found for receiver=%s", receiver_id)
 
+    # The push goes out in the background (see push_queue), so it has not
+    # been sent yet when the invite is answered
     response_data = {
         "success": True,
         "callId": call_id,
         "channelName": channel_name,
-        "pushSent": push_sent,
+        "pushSent": False,
+        "pushQueued": push_queued,
     }
 
-    if push_sent:
-        response_data["pushPlatform"] = push_platform
-    else:
+    if not push_queued:
         response_data["pushError"] = push_error
 
-    return JsonResponse(response_data)
+    return json_response(response_data)
 
 
 @csrf_exempt
+@allow_methods("POST")
 def call_answer(request):
     """
     Answer (accept or decline) a call.
     """
-    logger.info(f"[CALL/ANSWER] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/ANSWER] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
         return error
 
-    logger.info(f"[CALL/ANSWER] Request data: {data}")
+    logger.info("[CALL/ANSWER] Request data: %s", data)
 
     call_id = data.get("call_id")
     action = data.get("action")
 
     if not call_id:
-        return JsonResponse({"error": "missing_call_id"}, status=400)
+        return error_response("missing_call_id", 400)
 
     if action not in ["accept", "decline"]:
-        return JsonResponse({"error": "invalid_action", "valid": ["accept", "decline"]}, status=400)
+        return bytes_response(_INVALID_ACTION, 400)
 
-    call_record = firestore_service.get_call_record(call_id)
+    call_record = _load_call_record(call_id, "pending")
 
     if not call_record:
-        return JsonResponse({"error": "call_not_found"}, status=404)
+        return error_response("call_not_found", 404)
 
-    if call_record.get("status") != "pending":
-        logger.info(
-            "[CALL/ANSWER] Idempotent: call=%s status=%s action=%s",
-            call_id,
-            call_record.get("status"),
-            action,
+    if call_record.get("status") == "pending":
+        new_status = "accepted" if action == "accept" else "declined"
+        update_kwargs = {}
+        if action == "accept":
+            update_kwargs["answeredAt"] = server_timestamp()
+        else:
+            update_kwargs["endedAt"] = server_timestamp()
+
+        transitioned = firestore_service.transition_call_status(
+            call_id, "pending", new_status, **update_kwargs
         )
-        _cancel_missed_timeout(call_id)
-        return JsonResponse({
-            "success": True,
-            "callId": call_id,
-            "status": call_record.get("status"),
-        })
 
-    new_status = "accepted" if action == "accept" else "declined"
-    update_kwargs = {}
-    if action == "accept":
-        update_kwargs["answeredAt"] = timezone.now()
-    else:
-        update_kwargs["endedAt"] = timezone.now()
+        if transitioned is None:
+            return error_response("failed_to_update_status", 500)
 
-    updated = firestore_service.update_call_status(call_id, new_status, **update_kwargs)
+        if transitioned:
+            logger.info("[CALL/ANSWER] Call %s %sed", call_id, action)
 
-    if not updated:
-        return JsonResponse({"error": "failed_to_update_status"}, status=500)
+            _cancel_missed_timeout(call_id)
 
-    logger.info(f"[CALL/ANSWER] Call {call_id} {action}ed")
+            return json_response({
+                "success": True,
+                "callId": call_id,
+                "channelName": call_record.get("channelName"),
+                "status": new_status,
+            })
 
-    _cancel_missed_timeout(call_id)
+        # Another request moved the call on first; report where it ended up
+        call_record = firestore_service.get_call_record(call_id) or call_record
 
-    return JsonResponse({
+    logger.info(
+        "[CALL/ANSWER] Idempotent: call=%s status=%s action=%s",
+        call_id,
+        call_record.get("status"),
+        action,
+    )
+    _cancel_missed_timeout(call_id)
+    return json_response({
         "success": True,
         "callId": call_id,
-        "channelName": call_record.get("channelName"),
-        "status": new_status,
+        "status": call_record.get("status"),
     })
 
 
 @csrf_exempt
+@allow_methods("POST")
 def call_cancel(request):
     """
     Cancel a call (caller hangs up before answer).
     """
-    logger.info(f"[CALL/CANCEL] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/CANCEL] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
         return error
 
-    logger.info(f"[CALL/CANCEL] Request data: {data}")
+    logger.info("[CALL/CANCEL] Request data: %s", data)
 
     call_id = data.get("call_id")
 
     if not call_id:
-        return JsonResponse({"error": "missing_call_id"}, status=400)
+        return error_response("missing_call_id", 400)
 
-    call_record = firestore_service.get_call_record(call_id)
+    call_record = _load_call_record(call_id, "pending")
 
     if not call_record:
-        return JsonResponse({"error": "call_not_found"}, status=404)
+        return error_response("call_not_found", 404)
+
+    transitioned = False
+    if call_record.get("status") == "pending":
+        transitioned = firestore_service.transition_call_status(
+            call_id, "pending", "cancelled", endedAt=server_timestamp()
+        )
+        if transitioned is None:
+            return error_response("failed_to_update_status", 500)
+        if not transitioned:
+            call_record = firestore_service.get_call_record(call_id) or call_record
 
-    if call_record.get("status") != "pending":
+    if not transitioned:
         # Idempotent cancel: if call is already ended/missed, treat as success.
         logger.info(
             "[CALL/CANCEL] Idempotent: call=%s status=%s",
@@ -291,17 +273,12 @@ def call_cancel(request):
             call_record.get("status"),
         )
         _cancel_missed_timeout(call_id)
-        return JsonResponse({
+        return json_response({
             "success": True,
             "callId": call_id,
             "status": call_record.get("status"),
         })
 
-    updated = firestore_service.update_call_status(call_id, "cancelled", endedAt=timezone.now())
-
-    if not updated:
-        return JsonResponse({"error": "failed_to_update_status"}, status=500)
-
     receiver_id = call_record.get("receiverId")
     user_tokens = firestore_service.get_user_tokens(receiver_id)
 
@@ -311,37 +288,23 @@ def call_cancel(request):
             "[CALL/CANCEL] Tokens: receiver=%s platform=%s fcm=%s voip=%s",
             receiver_id,
             platform,
-            _token_fingerprint(user_tokens.get("fcmToken")),
-            _token_fingerprint(user_tokens.get("voipToken")),
+            token_fingerprint(user_tokens.get("fcmToken")),
+            token_fingerprint(user_tokens.get("voipToken")),
         )
-        result = run_async(push_service.send_call_cancelled_push(
-            platform=platform,
+        push_queue.enqueue_call_cancelled(
+            call_id,
+            platform,
             fcm_token=user_tokens.get("fcmToken"),
             voip_token=user_tokens.get("voipToken"),
-            call_id=call_id,
             channel_name=call_record.get("channelName"),
-        ))
-        if result.success:
-            logger.info(
-                "[CALL/CANCEL] Push success: call=%s platform=%s message_id=%s",
-                call_id,
-                result.platform,
-                result.message_id,
-            )
-        else:
-            logger.warning(
-                "[CALL/CANCEL] Push failed: call=%s platform=%s error=%s code=%s",
-                call_id,
-                result.platform,
-                result.error,
-                result.error_code,
-            )
+            receiver_id=receiver_id,
+        )
 
-    logger.info(f"[CALL/CANCEL] Call {call_id} cancelled")
+    logger.info("[CALL/CANCEL] Call %s cancelled", call_id)
 
     _cancel_missed_timeout(call_id)
 
-    return JsonResponse({
+    return json_response({
         "success": True,
         "callId": call_id,
         "status": "cancelled",
@@ -349,14 +312,12 @@ def call_cancel(request):
 
 
 @csrf_exempt
+@allow_methods("POST")
 def call_missed(request):
     """
     Mark a call as missed (client timeout).
     """
-    logger.info(f"[CALL/MISSED] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/MISSED] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
@@ -364,25 +325,31 @@ def call_missed(request):
 
     call_id = data.get("call_id")
     if not call_id:
-        return JsonResponse({"error": "missing_call_id"}, status=400)
+        return error_response("missing_call_id", 400)
 
-    call_record = firestore_service.get_call_record(call_id)
+    call_record = _load_call_record(call_id, "pending")
     if not call_record:
-        return JsonResponse({"error": "call_not_found"}, status=404)
+        return error_response("call_not_found", 404)
+
+    transitioned = False
+    if call_record.get("status") == "pending":
+        transitioned = firestore_service.transition_call_status(
+            call_id, "pending", "missed", endedAt=server_timestamp()
+        )
+        if transitioned is None:
+            return error_response("failed_to_update_status", 500)
+        if not transitioned:
+            call_record = firestore_service.get_call_record(call_id) or call_record
 
-    if call_record.get("status") != "pending":
-        return JsonResponse({
+    if not transitioned:
+        return json_response({
             "error": "call_not_pending",
             "currentStatus": call_record.get("status"),
         }, status=409)
 
-    updated = firestore_service.update_call_status(call_id, "missed", endedAt=timezone.now())
-    if not updated:
-        return JsonResponse({"error": "failed_to_update_status"}, status=500)
-
     _cancel_missed_timeout(call_id)
 
-    return JsonResponse({
+    return json_response({
         "success": True,
         "callId": call_id,
         "status": "missed",
@@ -390,14 +357,12 @@ def call_missed(request):
 
 
 @csrf_exempt
+@allow_methods("POST")
 def call_timeout_sweep(request):
     """
     Sweep pending calls and mark as missed if expired.
     """
-    logger.info(f"[CALL/TIMEOUT_SWEEP] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/TIMEOUT_SWEEP] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
@@ -407,27 +372,32 @@ def call_timeout_sweep(request):
     try:
         timeout_seconds = int(timeout_seconds)
     except (TypeError, ValueError):
-        return JsonResponse({"error": "invalid_timeout_seconds"}, status=400)
+        return error_response("invalid_timeout_seconds", 400)
 
     cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
     updated_count = firestore_service.mark_missed_expired(cutoff)
 
-    return JsonResponse({
+    return json_response({
         "success": True,
         "timeoutSeconds": timeout_seconds,
         "updatedCount": updated_count,
     })
 
 
+def _call_not_active(call_record):
+    return json_response({
+        "error": "call_not_active",
+        "currentStatus": call_record.get("status"),
+    }, status=409)
+
+
 @csrf_exempt
+@allow_methods("POST")
 def call_end(request):
     """
     End an active call.
     """
-    logger.info(f"[CALL/END] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[CALL/END] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
     data, error = json_body(request)
     if error:
@@ -436,18 +406,15 @@ def call_end(request):
     call_id = data.get("call_id")
 
     if not call_id:
-        return JsonResponse({"error": "missing_call_id"}, status=400)
+        return error_response("missing_call_id", 400)
 
-    call_record = firestore_service.get_call_record(call_id)
+    call_record = _load_call_record(call_id, "accepted")
 
     if not call_record:
-        return JsonResponse({"error": "call_not_found"}, status=404)
+        return error_response("call_not_found", 404)
 
     if call_record.get("status") != "accepted":
-        return JsonResponse({
-            "error": "call_not_active",
-            "currentStatus": call_record.get("status"),
-        }, status=409)
+        return _call_not_active(call_record)
 
     ended_at = timezone.now()
 
@@ -458,20 +425,24 @@ def call_end(request):
     if duration_base:
         duration = int((ended_at - duration_base).total_seconds())
 
-    updated = firestore_service.update_call_status(
+    transitioned = firestore_service.transition_call_status(
         call_id,
+        "accepted",
         "ended",
         endedAt=ended_at,
         durationSec=duration if duration is not None else 0,
     )
 
-    if not updated:
-        return JsonResponse({"error": "failed_to_update_status"}, status=500)
+    if transitioned is None:
+        return error_response("failed_to_update_status", 500)
+
+    if not transitioned:
+        return _call_not_active(firestore_service.get_call_record(call_id) or call_record)
 
-    logger.info(f"[CALL/END] Call {call_id} ended, duration={duration}s")
+    logger.info("[CALL/END] Call %s ended, duration=%ss", call_id, duration)
 
     _cancel_missed_timeout(call_id)
-    return JsonResponse({
+    return json_response({
         "success": True,
         "callId": call_id,
         "status": "ended",
@@ -480,33 +451,32 @@ def call_end(request):
 
 
 @csrf_exempt
+@allow_methods("GET")
 def call_status(request, call_id):
     """
     Get call status from Firestore.
     """
-    logger.info(f"[CALL/STATUS] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "GET":
-        return HttpResponseNotAllowed(["GET"])
+    logger.info("[CALL/STATUS] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
+    # Uncached: clients poll this to see transitions made by other workers
     call_record = firestore_service.get_call_record(call_id)
 
     if not call_record:
-        return JsonResponse({"error": "call_not_found"}, status=404)
+        return error_response("call_not_found", 404)
 
     def format_timestamp(ts):
         if ts is None:
             return None
         if hasattr(ts, "isoformat"):
             if timezone.is_naive(ts):
-                ts = timezone.make_aware(ts, timezone.get_current_timezone())
+                ts = timezone.make_aware(ts, CURRENT_TZ)
             return timezone.localtime(ts).isoformat()
         if hasattr(ts, "timestamp"):
-            dt = datetime.fromtimestamp(ts.timestamp(), tz=timezone.get_current_timezone())
+            dt = datetime.fromtimestamp(ts.timestamp(), tz=CURRENT_TZ)
             return dt.isoformat()
         return str(ts)
 
-    return JsonResponse({
+    return json_response({
         "callId": call_record.get("callId"),
         "channelName": call_record.get("channelName"),
         "groupId": call_record.get("groupId"),
@@ -1,26 +1,22 @@
 import logging
 
-from django.http import JsonResponse, HttpResponseNotAllowed
 from django.views.decorators.csrf import csrf_exempt
 
 from ..firebase_service import firestore_service
-from ..http import json_body
+from ..http import allow_methods, bytes_response, error_response, json_body, json_bytes, json_response
+from ..utils import firebase_uid
 
 logger = logging.getLogger("api")
 
-
-def _firebase_uid(request):
-    return getattr(request, "firebase_uid", None)
+_MISSING_FIELDS = json_bytes({"error": "missing_fields", "required": ["groupId", "receiverId"]})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def group_assign_receiver(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     data, error = json_body(request)
     if error:
@@ -29,15 +25,15 @@ def group_assign_receiver(request):
     group_id = data.get("groupId")
     receiver_id = data.get("receiverId")
     if not group_id or not receiver_id:
-        return JsonResponse({"error": "missing_fields", "required": ["groupId", "receiverId"]}, status=400)
+        return bytes_response(_MISSING_FIELDS, 400)
 
     result = firestore_service.assign_group_receiver(group_id, receiver_id, uid)
     if not result.get("ok"):
         error = result.get("error")
         if error == "group_not_found":
-            return JsonResponse({"error": "group_not_found"}, status=404)
+            return error_response("group_not_found", 404)
         if error == "not_member":
-            return JsonResponse({"error": "not_member"}, status=403)
-        return JsonResponse({"error": "failed_to_assign"}, status=500)
+            return error_response("not_member", 403)
+        return error_response("failed_to_assign", 500)
 
-    return JsonResponse({"assigned": bool(result.get("assigned"))})
+    return json_response({"assigned": bool(result.get("assigned"))})
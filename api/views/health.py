@@ -1,17 +1,26 @@
-from django.http import JsonResponse, HttpResponseNotAllowed
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
 from ..firebase_service import firestore_service
+from ..http import allow_methods
+from ..missed_timer import queue_depth
 
+# Probes hit this every few seconds; the bodies are prebuilt apart from the
+# missed-timer backlog, which is formatted into the template
+_HEALTH_BODIES = {
+    True: b'{"status": "ok", "firestore": "connected", "missedTimerQueue": %d}',
+    False: b'{"status": "ok", "firestore": "not_configured", "missedTimerQueue": %d}',
+}
 
-@csrf_exempt
-def health(request):
-    if request.method != "GET":
-        return HttpResponseNotAllowed(["GET"])
 
-    firestore_ok = firestore_service.is_available()
+def health_response() -> HttpResponse:
+    return HttpResponse(
+        _HEALTH_BODIES[firestore_service.is_available()] % queue_depth(),
+        content_type="application/json",
+    )
+
 
-    return JsonResponse({
-        "status": "ok",
-        "firestore": "connected" if firestore_ok else "not_configured",
-    })
+@csrf_exempt
+@allow_methods("GET")
+def health(request):
+    return health_response()
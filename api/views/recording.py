@@ -1,50 +1,42 @@
 import logging
-import os
 import time
 
-import requests
-from django.http import JsonResponse, HttpResponseNotAllowed
 from django.views.decorators.csrf import csrf_exempt
-from agora_token_builder import RtcTokenBuilder
 
-from ..constants import RECORDER_SERVICE_URL, ROLE_PUBLISHER
-from ..http import json_body, require_env
-from ..recording_client import recorder_service_post
+from ..agora import build_uid_token
+from ..constants import AGORA_APP_CERT, ROLE_PUBLISHER
+from ..http import allow_methods, error_response, missing_env, missing_env_response, with_json_body
+from ..recording_client import recorder_service_get, recorder_service_post
+from ..utils import run_async
 
 logger = logging.getLogger("api")
 
+_MISSING_ENV = missing_env("AGORA_APP_ID")
+
 
 @csrf_exempt
+@allow_methods("POST")
+@with_json_body
 def recording_start(request):
     """Start local recording - server joins channel and records audio."""
-    logger.info(f"[RECORDING/START] {request.method} from {request.META.get('REMOTE_ADDR')}")
-
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    logger.info("[RECORDING/START] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
-    missing_env = require_env("AGORA_APP_ID")
-    if missing_env:
-        return missing_env
+    if _MISSING_ENV:
+        return missing_env_response(_MISSING_ENV)
 
-    data, error = json_body(request)
-    if error:
-        return error
+    data = request._json
 
     channel = data.get("cname") or data.get("channel")
     if not channel:
-        return JsonResponse({"error": "missing_channel"}, status=400)
+        return error_response("missing_channel", 400)
 
     # Generate token for recorder bot (optional, for token-secured apps).
     token = data.get("token")
     if not token:
-        app_id = os.environ.get("AGORA_APP_ID")
-        app_cert = os.environ.get("AGORA_APP_CERT")
-        if app_cert:
+        if AGORA_APP_CERT:
             recorder_uid = data.get("uid", 999999)
             expire_ts = int(time.time()) + 3600 
-            token = RtcTokenBuilder.buildTokenWithUid(
-                app_id, app_cert, channel, recorder_uid, ROLE_PUBLISHER, expire_ts
-            )
+            token, _ = build_uid_token(channel, recorder_uid, ROLE_PUBLISHER, expire_ts)
 
     payload = {
         "channel": channel,
@@ -55,28 +47,25 @@ def recording_start(request):
         "receiverId": data.get("receiver_id"),
     }
 
-    return recorder_service_post("start", payload, allow_conflict_ok=True)
+    return run_async(recorder_service_post("start", payload, allow_conflict_ok=True))
 
 
 @csrf_exempt
+@allow_methods("POST")
+@with_json_body
 def recording_stop(request):
     """Stop local recording."""
-    logger.info(f"[RECORDING/STOP] {request.method} from {request.META.get('REMOTE_ADDR')}")
+    logger.info("[RECORDING/STOP] %s from %s", request.method, request.META.get("REMOTE_ADDR"))
 
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
+    data = request._json
 
-    data, error = json_body(request)
-    if error:
-        return error
-
-    logger.info(f"[RECORDING/STOP] Request data: {data}")
+    logger.info("[RECORDING/STOP] Request data: %s", data)
 
     sid = data.get("sid")
     channel = data.get("cname") or data.get("channel")
 
     if not sid and not channel:
-        return JsonResponse({"error": "missing_sid_or_channel"}, status=400)
+        return error_response("missing_sid_or_channel", 400)
 
     payload = {}
     if sid:
@@ -84,41 +73,23 @@ def recording_stop(request):
     if channel:
         payload["channel"] = channel
 
-    return recorder_service_post(
+    return run_async(recorder_service_post(
         "stop",
         payload,
         allow_not_found_ok=True,
         allow_conflict_ok=True,
-    )
+    ))
 
 
 @csrf_exempt
+@allow_methods("GET")
 def recording_status(request):
     """Get recording status / list active sessions."""
-    if request.method != "GET":
-        return HttpResponseNotAllowed(["GET"])
-
-    try:
-        response = requests.get(
-            f"{RECORDER_SERVICE_URL}/sessions",
-            timeout=10,
-        )
-        return JsonResponse(response.json(), status=response.status_code)
-    except requests.exceptions.ConnectionError:
-        return JsonResponse({"error": "recorder_service_unavailable"}, status=503)
+    return run_async(recorder_service_get("sessions"))
 
 
 @csrf_exempt
+@allow_methods("GET")
 def recording_list(request):
     """List saved recordings."""
-    if request.method != "GET":
-        return HttpResponseNotAllowed(["GET"])
-
-    try:
-        response = requests.get(
-            f"{RECORDER_SERVICE_URL}/recordings",
-            timeout=10,
-        )
-        return JsonResponse(response.json(), status=response.status_code)
-    except requests.exceptions.ConnectionError:
-        return JsonResponse({"error": "recorder_service_unavailable"}, status=503)
+    return run_async(recorder_service_get("recordings"))
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import re
@@ -8,11 +7,13 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
 from ..firebase_service import firestore_service
+from ..http import json_loads, json_response
+from ..utils import CURRENT_TZ, firebase_uid
 
 logger = logging.getLogger("api")
 
@@ -52,21 +53,17 @@ RESTRICTED_QUESTION_FIELDS = {
 }
 
 
-def _ok(payload: Dict[str, Any]) -> JsonResponse:
+def _ok(payload: Dict[str, Any]) -> HttpResponse:
     body = {"ok": True}
     body.update(payload)
-    return JsonResponse(body)
+    return json_response(body)
 
 
-def _err(status: int, code: str, message: str, extra: Optional[Dict[str, Any]] = None) -> JsonResponse:
+def _err(status: int, code: str, message: str, extra: Optional[Dict[str, Any]] = None) -> HttpResponse:
     body: Dict[str, Any] = {"ok": False, "code": code, "message": message}
     if extra:
         body.update(extra)
-    return JsonResponse(body, status=status)
-
-
-def _firebase_uid(request) -> Optional[str]:
-    return getattr(request, "firebase_uid", None)
+    return json_response(body, status=status)
 
 
 def _request_id(request) -> str:
@@ -137,14 +134,16 @@ def _is_restricted_questions_visible_today_et() -> bool:
     return today_et >= parsed.date()
 
 
-def _json_body(request) -> Tuple[Optional[Dict[str, Any]], Optional[JsonResponse]]:
+def _json_body(request) -> Tuple[Optional[Dict[str, Any]], Optional[HttpResponse]]:
+    raw = request.body
+    if not raw:
+        return {}, None
     try:
-        raw = request.body.decode("utf-8") if request.body else "{}"
-        data = json.loads(raw)
+        data = json_loads(raw)
         if not isinstance(data, dict):
             return None, _err(400, "invalid_json", "JSON body must be an object.")
         return data, None
-    except (json.JSONDecodeError, UnicodeDecodeError):
+    except (ValueError, UnicodeDecodeError):
         return None, _err(400, "invalid_json", "Malformed JSON body.")
 
 
@@ -175,12 +174,12 @@ def _as_int(value: Any, default: int = 0) -> int:
 
 def _to_dt(value: Any) -> datetime:
     if value is None:
-        return datetime.min.replace(tzinfo=timezone.get_current_timezone())
+        return datetime.min.replace(tzinfo=CURRENT_TZ)
     if hasattr(value, "to_datetime"):
         value = value.to_datetime()
     if isinstance(value, datetime):
         if timezone.is_naive(value):
-            return timezone.make_aware(value, timezone.get_current_timezone())
+            return timezone.make_aware(value, CURRENT_TZ)
         return timezone.localtime(value)
     if isinstance(value, str):
         text = value.strip()
@@ -190,11 +189,11 @@ def _to_dt(value: Any) -> datetime:
                     text = text.replace("Z", "+00:00")
                 parsed = datetime.fromisoformat(text)
                 if timezone.is_naive(parsed):
-                    return timezone.make_aware(parsed, timezone.get_current_timezone())
+                    return timezone.make_aware(parsed, CURRENT_TZ)
                 return timezone.localtime(parsed)
             except ValueError:
                 pass
-    return datetime.min.replace(tzinfo=timezone.get_current_timezone())
+    return datetime.min.replace(tzinfo=CURRENT_TZ)
 
 
 def _iso_or_empty(value: Any) -> str:
@@ -204,7 +203,7 @@ def _iso_or_empty(value: Any) -> str:
         value = value.to_datetime()
     if isinstance(value, datetime):
         if timezone.is_naive(value):
-            value = timezone.make_aware(value, timezone.get_current_timezone())
+            value = timezone.make_aware(value, CURRENT_TZ)
         return timezone.localtime(value).isoformat().replace("+00:00", "Z")
     if hasattr(value, "isoformat"):
         return value.isoformat()
@@ -217,12 +216,11 @@ def _log_result(
     uid: str,
     group_id: str = "",
     call_id: str = "",
-    started_at: Optional[datetime] = None,
+    started_at: Optional[int] = None,
     status: int = 200,
 ) -> None:
-    now = timezone.now()
-    started = started_at or now
-    latency_ms = int((now - started).total_seconds() * 1000)
+    # started_at is a time.monotonic_ns() reading
+    latency_ms = (time.monotonic_ns() - started_at) // 1_000_000 if started_at else 0
     logger.info(
         "[%s] requestId=%s uid=%s group_id=%s call_id=%s latency_ms=%s status=%s",
         name,
@@ -249,7 +247,7 @@ def _group_members(group_data: Dict[str, Any]) -> Set[str]:
     return {str(v).strip() for v in members if str(v).strip()}
 
 
-def _validate_method(request, expected: str) -> Optional[JsonResponse]:
+def _validate_method(request, expected: str) -> Optional[HttpResponse]:
     if request.method != expected:
         return _err(400, "invalid_method", f"Expected {expected} request.")
     return None
@@ -389,9 +387,9 @@ def _legacy_review_view_fields(row: Dict[str, Any]) -> Dict[str, Any]:
 
 @csrf_exempt
 def reviews_config(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     status_code = 200
     call_id = ""
     group_id = ""
@@ -415,8 +413,8 @@ def reviews_config(request):
         )
         status_code = 200
         if visible_date:
-            return JsonResponse({"restrictedQuestionsVisibleDateEt": visible_date})
-        return JsonResponse({})
+            return json_response({"restrictedQuestionsVisibleDateEt": visible_date})
+        return json_response({})
     except Exception as exc:
         logger.exception("[REVIEWS/CONFIG] failed: requestId=%s error=%s", request_id, exc)
         status_code = 500
@@ -427,9 +425,9 @@ def reviews_config(request):
 
 @csrf_exempt
 def reviews_config_invalidate_cache(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     status_code = 200
     call_id = ""
     group_id = ""
@@ -458,9 +456,9 @@ def reviews_config_invalidate_cache(request):
 
 @csrf_exempt
 def reviews_feed(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     group_id = _as_str(request.GET.get("group_id"))
     call_id = ""
     status_code = 200
@@ -569,7 +567,7 @@ def reviews_feed(request):
             next_cursor = _as_str(last_call_data.get("callId"), page_calls[-1].id)
 
         status_code = 200
-        return JsonResponse({"items": items, "nextCursor": next_cursor, "hasMore": has_more})
+        return json_response({"items": items, "nextCursor": next_cursor, "hasMore": has_more})
     except Exception as exc:
         logger.exception("[REVIEWS/FEED] failed: requestId=%s error=%s", request_id, exc)
         status_code = 500
@@ -580,9 +578,9 @@ def reviews_feed(request):
 
 @csrf_exempt
 def reviews_context(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     call_id = _as_str(request.GET.get("call_id"))
     group_id = ""
     status_code = 200
@@ -738,9 +736,9 @@ def reviews_context(request):
 
 @csrf_exempt
 def reviews_my(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     call_id = _as_str(request.GET.get("call_id"))
     group_id = ""
     status_code = 200
@@ -799,7 +797,7 @@ def reviews_my(request):
         _log_result("REVIEWS/MY", request_id, uid, group_id=group_id, call_id=call_id, started_at=started_at, status=status_code)
 
 
-def _validate_upsert_payload(data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[JsonResponse]]:
+def _validate_upsert_payload(data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[HttpResponse]]:
     unknown_keys = sorted([k for k in data.keys() if k not in UPSERT_ALLOWED_KEYS])
     if unknown_keys:
         return None, _err(400, "invalid_fields", "Unknown fields provided.", {"fields": unknown_keys})
@@ -856,9 +854,9 @@ def _decrement_counter(transaction, ref, field_name: str):
 
 @csrf_exempt
 def reviews_upsert(request):
-    started_at = timezone.now()
+    started_at = time.monotonic_ns()
     request_id = _request_id(request)
-    uid = _firebase_uid(request) or ""
+    uid = firebase_uid(request) or ""
     call_id = ""
     group_id = ""
     status_code = 200
@@ -1068,6 +1066,7 @@ def reviews_upsert(request):
             return {"ok": True, "reviewId": review_id, "mode": mode}
 
         result = _txn(db.transaction())
+        firestore_service.invalidate_call_record(call_id)
         logger.info("[REVIEWS/UPSERT] txn result requestId=%s result=%s", request_id, result)
         if not result.get("ok"):
             error = result.get("error")
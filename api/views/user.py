@@ -5,13 +5,13 @@ from datetime import timedelta
 from typing import Optional
 
 from django.core.mail import send_mail
-from django.http import JsonResponse, HttpResponseNotAllowed
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
-from ..firebase_service import firestore_service, get_firebase_app
-from ..http import json_body
+from ..firebase_service import firestore_service, get_firebase_app, server_timestamp
+from ..http import allow_methods, bytes_response, error_response, json_body, json_bytes, json_response
+from ..utils import CURRENT_TZ, firebase_uid, token_fingerprint
 
 logger = logging.getLogger("api")
 
@@ -20,16 +20,9 @@ DELETION_GRACE_DAYS = 30
 MAX_PROFILE_IMAGE_SIZE = 5 * 1024 * 1024
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png"}
 
-def _token_fingerprint(token: Optional[str]) -> str:
-    if not token:
-        return "missing"
-    tail = token[-6:] if len(token) >= 6 else token
-    return f"len={len(token)},tail={tail}"
-
-
-def _firebase_uid(request) -> Optional[str]:
-    return getattr(request, "firebase_uid", None)
-
+_DELETE_REQUEST_MISSING_FIELDS = json_bytes(
+    {"error": "missing_fields", "required": ["uid", "email", "notifyEmail"]}
+)
 
 def _as_datetime_or_none(value):
     if value is None:
@@ -41,35 +34,31 @@ def _as_datetime_or_none(value):
         if parsed is None:
             return None
         if timezone.is_naive(parsed):
-            return timezone.make_aware(parsed, timezone.get_current_timezone())
+            return timezone.make_aware(parsed, CURRENT_TZ)
         return parsed
     return None
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_exists(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     exists = firestore_service.user_exists(uid)
     if exists is None:
-        return JsonResponse({"error": "firestore_unavailable"}, status=503)
+        return error_response("firestore_unavailable", 503)
 
-    return JsonResponse({"exists": bool(exists)})
+    return json_response({"exists": bool(exists)})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_create(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     data, error = json_body(request)
     if error:
@@ -89,19 +78,17 @@ def user_create(request):
 
     created = firestore_service.create_user(uid, payload)
     if not created:
-        return JsonResponse({"error": "failed_to_create_user"}, status=500)
+        return error_response("failed_to_create_user", 500)
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_update(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     data, error = json_body(request)
     if error:
@@ -112,42 +99,38 @@ def user_update(request):
         if key in data:
             update_payload[key] = data.get(key)
 
-    update_payload["lastActivityAt"] = timezone.now()
+    update_payload["lastActivityAt"] = server_timestamp()
 
     if not update_payload:
-        return JsonResponse({"ok": True})
+        return json_response({"ok": True})
 
     updated = firestore_service.update_user(uid, update_payload)
     if not updated:
-        return JsonResponse({"error": "failed_to_update_user"}, status=500)
+        return error_response("failed_to_update_user", 500)
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_delete(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     deleted = firestore_service.delete_user(uid)
     if not deleted:
-        return JsonResponse({"error": "failed_to_delete_user"}, status=500)
+        return error_response("failed_to_delete_user", 500)
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_push_tokens(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     data, error = json_body(request)
     if error:
@@ -159,34 +142,32 @@ def user_push_tokens(request):
             update_payload[key] = data.get(key)
 
     if "platform" in update_payload and update_payload["platform"] not in {"ios", "android"}:
-        return JsonResponse({"error": "invalid_platform"}, status=400)
+        return error_response("invalid_platform", 400)
 
-    update_payload["tokensUpdatedAt"] = timezone.now()
+    update_payload["tokensUpdatedAt"] = server_timestamp()
 
     updated = firestore_service.update_push_tokens(uid, update_payload)
     if not updated:
-        return JsonResponse({"error": "failed_to_update_tokens"}, status=500)
+        return error_response("failed_to_update_tokens", 500)
 
     logger.info(
         "[USER/PUSH_TOKENS] Updated: uid=%s platform=%s fcm=%s apns=%s voip=%s",
         uid,
         update_payload.get("platform"),
-        _token_fingerprint(update_payload.get("fcmToken")),
-        _token_fingerprint(update_payload.get("apnsToken")),
-        _token_fingerprint(update_payload.get("voipToken")),
+        token_fingerprint(update_payload.get("fcmToken")),
+        token_fingerprint(update_payload.get("apnsToken")),
+        token_fingerprint(update_payload.get("voipToken")),
     )
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_profile_image(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     logger.info("[PROFILE_IMAGE] Upload request: uid=%s FILES=%s content_type=%s",
                 uid, list(request.FILES.keys()), request.content_type)
@@ -194,34 +175,34 @@ def user_profile_image(request):
     file_obj = request.FILES.get("file")
     if not file_obj:
         logger.warning("[PROFILE_IMAGE] No file in request: uid=%s", uid)
-        return JsonResponse({"error": "missing_file"}, status=400)
+        return error_response("missing_file", 400)
 
     logger.info("[PROFILE_IMAGE] File received: uid=%s name=%s size=%s type=%s",
                 uid, file_obj.name, file_obj.size, file_obj.content_type)
 
     if file_obj.size > MAX_PROFILE_IMAGE_SIZE:
         logger.warning("[PROFILE_IMAGE] File too large: uid=%s size=%s", uid, file_obj.size)
-        return JsonResponse({"error": "file_too_large"}, status=400)
+        return error_response("file_too_large", 400)
 
     if file_obj.content_type not in ALLOWED_IMAGE_TYPES:
         logger.warning("[PROFILE_IMAGE] Invalid type: uid=%s type=%s", uid, file_obj.content_type)
-        return JsonResponse({"error": "invalid_file_type"}, status=400)
+        return error_response("invalid_file_type", 400)
 
     bucket_name = os.environ.get("FIREBASE_STORAGE_BUCKET")
     if not bucket_name:
         logger.error("[PROFILE_IMAGE] FIREBASE_STORAGE_BUCKET not set")
-        return JsonResponse({"error": "missing_storage_bucket"}, status=500)
+        return error_response("missing_storage_bucket", 500)
 
     app = get_firebase_app()
     if app is None:
         logger.error("[PROFILE_IMAGE] Firebase app not initialized")
-        return JsonResponse({"error": "firestore_unavailable"}, status=503)
+        return error_response("firestore_unavailable", 503)
 
     try:
         from firebase_admin import storage
     except Exception as exc:
         logger.error("[PROFILE_IMAGE] Failed to import storage: %s", exc)
-        return JsonResponse({"error": "storage_unavailable"}, status=500)
+        return error_response("storage_unavailable", 500)
 
     filename = f"profile_images/{uid}/{int(time.time())}_{file_obj.name}"
     try:
@@ -233,30 +214,28 @@ def user_profile_image(request):
         logger.info("[PROFILE_IMAGE] Uploaded: uid=%s path=%s url=%s", uid, filename, url)
     except Exception as exc:
         logger.error("[PROFILE_IMAGE] Upload failed: uid=%s error=%s", uid, exc)
-        return JsonResponse({"error": "upload_failed", "detail": str(exc)}, status=500)
+        return json_response({"error": "upload_failed", "detail": str(exc)}, status=500)
 
     firestore_service.update_user(uid, {
         "profileImage": url,
         "profileImagePath": filename,
-        "profileImageUpdatedAt": timezone.now(),
-        "lastActivityAt": timezone.now(),
+        "profileImageUpdatedAt": server_timestamp(),
+        "lastActivityAt": server_timestamp(),
     })
     logger.info("[PROFILE_IMAGE] Firestore updated: uid=%s", uid)
 
-    return JsonResponse({"ok": True, "url": url})
+    return json_response({"ok": True, "url": url})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_profile_image_delete(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    uid = _firebase_uid(request)
+    uid = firebase_uid(request)
     if not uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     if not firestore_service.db:
-        return JsonResponse({"error": "firestore_unavailable"}, status=503)
+        return error_response("firestore_unavailable", 503)
 
     logger.info("[PROFILE_IMAGE_DELETE] Request: uid=%s", uid)
 
@@ -283,22 +262,20 @@ def user_profile_image_delete(request):
     firestore_service.update_user(uid, {
         "profileImage": "",
         "profileImagePath": "",
-        "profileImageUpdatedAt": timezone.now(),
-        "lastActivityAt": timezone.now(),
+        "profileImageUpdatedAt": server_timestamp(),
+        "lastActivityAt": server_timestamp(),
     })
     logger.info("[PROFILE_IMAGE_DELETE] Firestore cleared: uid=%s", uid)
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 @csrf_exempt
+@allow_methods("POST")
 def user_delete_request(request):
-    if request.method != "POST":
-        return HttpResponseNotAllowed(["POST"])
-
-    token_uid = _firebase_uid(request)
+    token_uid = firebase_uid(request)
     if not token_uid:
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return error_response("unauthorized", 401)
 
     data, error = json_body(request)
     if error:
@@ -309,17 +286,14 @@ def user_delete_request(request):
     notify_email = data.get("notifyEmail")
 
     if not body_uid or not email or not notify_email:
-        return JsonResponse(
-            {"error": "missing_fields", "required": ["uid", "email", "notifyEmail"]},
-            status=400,
-        )
+        return bytes_response(_DELETE_REQUEST_MISSING_FIELDS, 400)
 
     if body_uid != token_uid:
         logger.warning("[DELETE_REQUEST] uid mismatch: token=%s body=%s", token_uid, body_uid)
-        return JsonResponse({"error": "uid_mismatch"}, status=403)
+        return error_response("uid_mismatch", 403)
 
     if not firestore_service.db:
-        return JsonResponse({"error": "firestore_unavailable"}, status=503)
+        return error_response("firestore_unavailable", 503)
 
     now = timezone.now()
     requested_at_raw = data.get("requestedAt")
@@ -386,7 +360,7 @@ def user_delete_request(request):
         logger.info("[DELETE_REQUEST] Firestore userDeletionRequests/%s written", body_uid)
     except Exception as exc:
         logger.error("[DELETE_REQUEST] Firestore write failed (deletionRequests): uid=%s error=%s", body_uid, exc)
-        return JsonResponse({"error": "firestore_write_failed"}, status=500)
+        return error_response("firestore_write_failed", 500)
 
     try:
         firestore_service.update_user(body_uid, {
@@ -399,7 +373,7 @@ def user_delete_request(request):
         logger.error("[DELETE_REQUEST] Firestore user update failed: uid=%s error=%s", body_uid, exc)
 
     scheduled_str = scheduled_delete_at.isoformat()
-    return JsonResponse({
+    return json_response({
         "ok": True,
         "status": "requested",
         "uid": body_uid,
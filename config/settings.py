@@ -21,24 +21,18 @@ CSRF_TRUSTED_ORIGINS = [
 
 INSTALLED_APPS = [
     "corsheaders",
-    "django.contrib.admin",
-    "django.contrib.auth",
-    "django.contrib.messages",
-    "django.contrib.contenttypes",
-    "django.contrib.sessions",
     "django.contrib.staticfiles",
     "api",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    # After CORS so browser health checks still get Access-Control-* headers
+    "api.middleware.HealthCheckMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "api.middleware.FirebaseAuthMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -60,8 +54,6 @@ TEMPLATES = [
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
             ],
         },
     },
@@ -69,14 +61,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
-# Django still needs a database for admin/sessions, but we don't use it for app data
-# All app data (calls, users) is stored in Firebase Firestore
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# No SQL database: all app data (calls, users) is stored in Firebase Firestore,
+# and auth is Firebase ID tokens, so there are no Django sessions/admin
+DATABASES = {}
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "America/New_York"
@@ -110,11 +97,6 @@ LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "verbose": {
-            "format": "[{asctime}] {levelname} {name} {message}",
-            "style": "{",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
         "simple": {
             "format": "[{asctime}] {levelname} {message}",
             "style": "{",
@@ -126,29 +108,29 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
-        "file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "django.log",
-            "formatter": "verbose",
-        },
-        "api_file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "api.log",
-            "formatter": "verbose",
+        # File writes happen on a background listener (see api.log_queue)
+        "file_queue": {
+            "()": "api.log_queue.queue_handler",
+            "files": {
+                str(LOG_DIR / "django.log"): "django",
+                str(LOG_DIR / "api.log"): "api",
+            },
+            "fmt": "[{asctime}] {levelname} {name} {message}",
+            "datefmt": "%Y-%m-%d %H:%M:%S",
         },
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["console", "file_queue"],
             "level": "INFO",
         },
         "django.request": {
-            "handlers": ["console", "file"],
+            "handlers": ["console", "file_queue"],
             "level": "DEBUG",
             "propagate": False,
         },
         "api": {
-            "handlers": ["console", "api_file"],
+            "handlers": ["console", "file_queue"],
             "level": "DEBUG",
             "propagate": False,
         },
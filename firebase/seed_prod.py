@@ -6,12 +6,15 @@ Run with: python3 firebase/seed_prod.py --confirm-prod [--reset]
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+NY_TZ = ZoneInfo("America/New_York")
+
 
 def _require_env(name):
     value = os.environ.get(name)
@@ -56,18 +59,70 @@ def _non_empty_str(value, default):
     return text if text else default
 
 
-def _clear_collection(collection_ref):
-    for doc in collection_ref.stream():
-        doc.reference.delete()
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_data.json")
+
+
+def _load_seed_data(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+SEED_DATA = _load_seed_data(SEED_DATA_PATH)
+
+RESIDENCES = SEED_DATA["residences"]
+RESIDENCES_2 = SEED_DATA["residences_2"]
+CALLS = SEED_DATA["calls"]
+CALLS_2 = SEED_DATA["calls_2"]
+
+
+def _major_residences(residences):
+    """Normalized residence entries; built once at import."""
+    return [
+        {
+            "residenceId": r["id"],
+            "era": _non_empty_str(r.get("era"), "시기 미상"),
+            "location": _non_empty_str(r.get("location"), "장소 미상"),
+            "detail": _non_empty_str(r.get("detail"), ""),
+        }
+        for r in residences
+    ]
+
+
+MAJOR_RESIDENCES = _major_residences(RESIDENCES)
+MAJOR_RESIDENCES_2 = _major_residences(RESIDENCES_2)
+
+
+DELETE_BATCH_LIMIT = 500
+
+
+def _clear_collection(db, collection_ref):
+    if hasattr(db, "recursive_delete"):
+        # Also removes subcollections (reviews, residence_stats) via BulkWriter
+        db.recursive_delete(collection_ref)
+        return
+
+    batch = db.batch()
+    count = 0
+    # Keys-only query: deleting needs the references, not the document data
+    for doc in collection_ref.select([]).stream():
+        batch.delete(doc.reference)
+        count += 1
+        if count == DELETE_BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            count = 0
+    if count:
+        batch.commit()
 
 
 def clear_all(db):
     print("🧹 Clearing Firestore production data...")
-    # _clear_collection(db.collection("users"))
-    _clear_collection(db.collection("groups"))
-    _clear_collection(db.collection("receivers"))
-    _clear_collection(db.collection("calls"))
-    _clear_collection(db.collection("meta"))
+    # "users" is deliberately left out
+    names = ["groups", "receivers", "calls", "meta"]
+    # The collections are independent; clear them concurrently
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        # list() surfaces the first failure instead of dropping it
+        list(pool.map(lambda name: _clear_collection(db, db.collection(name)), names))
     print("✅ Clear completed")
 
 
@@ -86,131 +141,13 @@ def seed(db):
     user_c = "user_minho"
     user_d = "user_sora"
 
-    residences = [
-        {
-            "id": "res_1950s_andong",
-            "era": "1950~1965",
-            "location": "경상북도 안동시",
-            "detail": "태어난 곳, 어린 시절",
-        },
-        {
-            "id": "res_1960s_jongno",
-            "era": "1966~1975",
-            "location": "서울 종로구",
-            "detail": "학창시절, 결혼 전",
-        },
-        {
-            "id": "res_1975s_gangnam",
-            "era": "1976~1989",
-            "location": "서울 강남구",
-            "detail": "신혼, 자녀 양육기",
-        },
-        {
-            "id": "res_1990s_bundang",
-            "era": "1990~2010",
-            "location": "경기도 분당",
-            "detail": "자녀 독립 후",
-        },
-        {
-            "id": "res_2010s_seocho",
-            "era": "2011~현재",
-            "location": "서울 서초구",
-            "detail": "현재 거주지",
-        },
-    ]
+    now = datetime.now(NY_TZ)
+    writer = db.bulk_writer()
+    # Each group, its receivers and their residence_stats commit atomically
+    group_batch = db.batch()
+    group_batch_2 = db.batch()
 
-    residences_2 = [
-        {
-            "id": "res_1940s_yeosu",
-            "era": "1945~1958",
-            "location": "전라남도 여수시",
-            "detail": "피난 이후 정착, 가족과의 추억",
-        },
-        {
-            "id": "res_1960s_mapo",
-            "era": "1959~1972",
-            "location": "서울 마포구",
-            "detail": "직장 생활 시작, 사회 초년기",
-        },
-        {
-            "id": "res_1970s_daejeon",
-            "era": "1973~1985",
-            "location": "대전 서구",
-            "detail": "자녀 출생, 이사와 적응",
-        },
-        {
-            "id": "res_1990s_ilsan",
-            "era": "1986~2005",
-            "location": "경기도 일산",
-            "detail": "가족 중심 생활, 이웃 관계",
-        },
-        {
-            "id": "res_2000s_songpa",
-            "era": "2006~현재",
-            "location": "서울 송파구",
-            "detail": "현재 거주, 건강 관리",
-        },
-    ]
-
-    calls = [
-        {
-            "call_id": "call_001",
-            "summary": "안동 어린 시절 이야기",
-            "residences": ["res_1950s_andong"],
-        },
-        {
-            "call_id": "call_002",
-            "summary": "종로 학창시절 회상",
-            "residences": ["res_1960s_jongno"],
-        },
-        {
-            "call_id": "call_003",
-            "summary": "강남에서 자녀 양육기 이야기",
-            "residences": ["res_1975s_gangnam"],
-        },
-        {
-            "call_id": "call_004",
-            "summary": "분당 신도시 정착기",
-            "residences": ["res_1990s_bundang"],
-        },
-        {
-            "call_id": "call_005",
-            "summary": "서초에서의 현재 일상",
-            "residences": ["res_2010s_seocho"],
-        },
-    ]
-
-    calls_2 = [
-        {
-            "call_id": "call_101",
-            "summary": "여수 피난 이후 기억",
-            "residences": ["res_1940s_yeosu"],
-        },
-        {
-            "call_id": "call_102",
-            "summary": "마포에서 사회 초년기 이야기",
-            "residences": ["res_1960s_mapo"],
-        },
-        {
-            "call_id": "call_103",
-            "summary": "대전 이사와 자녀 출생기",
-            "residences": ["res_1970s_daejeon"],
-        },
-        {
-            "call_id": "call_104",
-            "summary": "일산에서의 가족 생활",
-            "residences": ["res_1990s_ilsan"],
-        },
-        {
-            "call_id": "call_105",
-            "summary": "송파 현재 일상과 건강 이야기",
-            "residences": ["res_2000s_songpa"],
-        },
-    ]
-
-    now = datetime.now(ZoneInfo("America/New_York"))
-
-    db.collection("users").document(user_a).set({
+    writer.set(db.collection("users").document(user_a), {
         "uid": user_a,
         "name": "Jungwon",
         "email": "jungwon@test.com",
@@ -219,7 +156,7 @@ def seed(db):
         "createdAt": now,
     })
 
-    db.collection("users").document(user_b).set({
+    writer.set(db.collection("users").document(user_b), {
         "uid": user_b,
         "name": "Alice",
         "email": "alice@test.com",
@@ -228,7 +165,7 @@ def seed(db):
         "createdAt": now,
     })
 
-    db.collection("users").document(user_c).set({
+    writer.set(db.collection("users").document(user_c), {
         "uid": user_c,
         "name": "Minho",
         "email": "minho@test.com",
@@ -237,7 +174,7 @@ def seed(db):
         "createdAt": now,
     })
 
-    db.collection("users").document(user_d).set({
+    writer.set(db.collection("users").document(user_d), {
         "uid": user_d,
         "name": "Sora",
         "email": "sora@test.com",
@@ -246,225 +183,206 @@ def seed(db):
         "createdAt": now,
     })
 
-    db.collection("groups").document(group_id).set({
+    group_batch.set(db.collection("groups").document(group_id), {
         "groupId": group_id,
         "name": "Boston Care Group",
         "careGiverUserIds": [user_a, user_b],
         "receiverId": receiver_id,
         "stats": {
-            "totalCalls": len(calls),
-            "lastCallId": calls[-1]["call_id"],
+            "totalCalls": len(CALLS),
+            "lastCallId": CALLS[-1]["call_id"],
             "lastCallAt": now,
         },
     })
 
-    db.collection("groups").document(group_id_2).set({
+    group_batch_2.set(db.collection("groups").document(group_id_2), {
         "groupId": group_id_2,
         "name": "Seoul Memory Group",
         "careGiverUserIds": [user_c, user_d],
         "receiverId": receiver_id_2,
         "stats": {
-            "totalCalls": len(calls_2),
-            "lastCallId": calls_2[-1]["call_id"],
+            "totalCalls": len(CALLS_2),
+            "lastCallId": CALLS_2[-1]["call_id"],
             "lastCallAt": now,
         },
     })
 
-    db.collection("receivers").document(receiver_id).set({
+    group_batch.set(db.collection("receivers").document(receiver_id), {
         "receiverId": receiver_id,
         "groupId": group_id,
         "name": "김영옥",
         "profileImage": "https://placehold.co/200x200",
-        "majorResidences": [
-            {
-                "residenceId": r["id"],
-                "era": _non_empty_str(r.get("era"), "시기 미상"),
-                "location": _non_empty_str(r.get("location"), "장소 미상"),
-                "detail": _non_empty_str(r.get("detail"), ""),
-            }
-            for r in residences
-        ],
+        "majorResidences": MAJOR_RESIDENCES,
     })
 
-    db.collection("receivers").document(receiver_id_3).set({
+    group_batch.set(db.collection("receivers").document(receiver_id_3), {
         "receiverId": receiver_id_3,
         "groupId": group_id,
         "name": "Seonghoon",
         "profileImage": "https://placehold.co/200x200",
-        "majorResidences": [
-            {
-                "residenceId": r["id"],
-                "era": _non_empty_str(r.get("era"), "시기 미상"),
-                "location": _non_empty_str(r.get("location"), "장소 미상"),
-                "detail": _non_empty_str(r.get("detail"), ""),
-            }
-            for r in residences
-        ],
+        "majorResidences": MAJOR_RESIDENCES,
     })
 
-    db.collection("receivers").document(receiver_id_2).set({
+    group_batch_2.set(db.collection("receivers").document(receiver_id_2), {
         "receiverId": receiver_id_2,
         "groupId": group_id_2,
         "name": "박정희",
         "profileImage": "https://placehold.co/200x200",
-        "majorResidences": [
-            {
-                "residenceId": r["id"],
-                "era": _non_empty_str(r.get("era"), "시기 미상"),
-                "location": _non_empty_str(r.get("location"), "장소 미상"),
-                "detail": _non_empty_str(r.get("detail"), ""),
-            }
-            for r in residences_2
-        ],
+        "majorResidences": MAJOR_RESIDENCES_2,
     })
 
-    for r in residences:
-        era = _non_empty_str(r.get("era"), "시기 미상")
-        location = _non_empty_str(r.get("location"), "장소 미상")
-        detail = _non_empty_str(r.get("detail"), "")
+    stats_col = db.collection("receivers").document(receiver_id).collection("residence_stats")
+    stats_col_3 = db.collection("receivers").document(receiver_id_3).collection("residence_stats")
+    for r in MAJOR_RESIDENCES:
+        era, location, detail = r["era"], r["location"], r["detail"]
         ai_summary = (
             f"{era}({location})의 기억은 일상과 관계 중심으로 정리됩니다."
             + (f" 주요 단서: {detail}." if detail else "")
         )
 
-        db.collection("receivers").document(receiver_id) \
-            .collection("residence_stats").document(r["id"]).set({
-                "groupId": group_id,
-                "receiverId": receiver_id,
-                "residenceId": r["id"],
-                "era": era,
-                "location": location,
-                "detail": detail,
-                "keywords": ["가족", "추억"],
-                "totalCalls": 1,
-                "lastCallAt": now,
-                "aiSummary": ai_summary,
-                "humanComments": ["이 시절 이야기가 자주 등장함"],
-            })
-
-        db.collection("receivers").document(receiver_id_3) \
-            .collection("residence_stats").document(r["id"]).set({
-                "groupId": group_id,
-                "receiverId": receiver_id_3,
-                "residenceId": r["id"],
-                "era": era,
-                "location": location,
-                "detail": detail,
-                "keywords": ["가족", "추억"],
-                "totalCalls": 1,
-                "lastCallAt": now,
-                "aiSummary": ai_summary,
-                "humanComments": ["이 시절 이야기가 자주 등장함"],
-            })
-
-    for r in residences_2:
-        era = _non_empty_str(r.get("era"), "시기 미상")
-        location = _non_empty_str(r.get("location"), "장소 미상")
-        detail = _non_empty_str(r.get("detail"), "")
+        base = {
+            "groupId": group_id,
+            "residenceId": r["residenceId"],
+            "era": era,
+            "location": location,
+            "detail": detail,
+            "keywords": ["가족", "추억"],
+            "totalCalls": 1,
+            "lastCallAt": now,
+            "aiSummary": ai_summary,
+            "humanComments": ["이 시절 이야기가 자주 등장함"],
+        }
+        group_batch.set(stats_col.document(r["residenceId"]), {**base, "receiverId": receiver_id})
+        group_batch.set(stats_col_3.document(r["residenceId"]), {**base, "receiverId": receiver_id_3})
+
+    stats_col_2 = db.collection("receivers").document(receiver_id_2).collection("residence_stats")
+    for r in MAJOR_RESIDENCES_2:
+        era, location, detail = r["era"], r["location"], r["detail"]
         ai_summary = (
             f"{era}({location})의 기억은 생활 변화와 가족 이야기 중심으로 정리됩니다."
             + (f" 주요 단서: {detail}." if detail else "")
         )
 
-        db.collection("receivers").document(receiver_id_2) \
-            .collection("residence_stats").document(r["id"]).set({
-                "groupId": group_id_2,
-                "receiverId": receiver_id_2,
-                "residenceId": r["id"],
-                "era": era,
-                "location": location,
-                "detail": detail,
-                "keywords": ["이사", "가족", "직장"],
-                "totalCalls": 1,
-                "lastCallAt": now,
-                "aiSummary": ai_summary,
-                "humanComments": ["중요한 전환점이 된 시기"],
-            })
-
-    for i, c in enumerate(calls):
-        call_ref = db.collection("calls").document(c["call_id"])
-
-        created_at = (now - timedelta(days=3 - i))
-        answered_at = created_at + timedelta(seconds=5)
-        ended_at = created_at + timedelta(seconds=600)
-        channel_name = f"{group_id}_{user_a}_{receiver_id}_{int(created_at.timestamp() * 1000)}"
-
-        call_ref.set({
+        group_batch_2.set(stats_col_2.document(r["residenceId"]), {
+            "groupId": group_id_2,
+            "receiverId": receiver_id_2,
+            "residenceId": r["residenceId"],
+            "era": era,
+            "location": location,
+            "detail": detail,
+            "keywords": ["이사", "가족", "직장"],
+            "totalCalls": 1,
+            "lastCallAt": now,
+            "aiSummary": ai_summary,
+            "humanComments": ["중요한 전환점이 된 시기"],
+        })
+
+    group_batch.commit()
+    group_batch_2.commit()
+
+    calls_col = db.collection("calls")
+
+    call_base = {
+        "groupId": group_id,
+        "receiverId": receiver_id,
+        "caregiverUserId": user_a,
+        "groupNameSnapshot": "Boston Care Group",
+        "giverNameSnapshot": "Jungwon",
+        "receiverNameSnapshot": "김영옥",
+        "durationSec": 600,
+        "status": "ended",
+        "humanSummary": "",
+        "humanKeywords": [],
+        "humanNotes": "",
+        "aiSummary": "",
+        "reviewCount": 1,
+        "lastReviewAt": now,
+    }
+    review_base = {
+        "writerUserId": user_a,
+        "writerNameSnapshot": "Jungwon",
+        "humanSummary": "대화가 자연스럽고 감정이 잘 드러났음",
+        "humanKeywords": ["따뜻함"],
+        "mood": "warm",
+        "comment": "다음에도 비슷한 질문을 이어가면 좋겠다",
+        "createdAt": now,
+    }
+    channel_prefix = f"{group_id}_{user_a}_{receiver_id}_"
+    answer_delay = timedelta(seconds=5)
+    call_length = timedelta(seconds=600)
+    for i, c in enumerate(CALLS):
+        call_ref = calls_col.document(c["call_id"])
+
+        created_at = now - timedelta(days=3 - i)
+        answered_at = created_at + answer_delay
+        ended_at = created_at + call_length
+
+        writer.set(call_ref, {
+            **call_base,
             "callId": c["call_id"],
-            "channelName": channel_name,
-            "groupId": group_id,
-            "receiverId": receiver_id,
-            "caregiverUserId": user_a,
-            "groupNameSnapshot": "Boston Care Group",
-            "giverNameSnapshot": "Jungwon",
-            "receiverNameSnapshot": "김영옥",
+            "channelName": f"{channel_prefix}{int(created_at.timestamp() * 1000)}",
             "createdAt": created_at,
             "answeredAt": answered_at,
             "endedAt": ended_at,
-            "durationSec": 600,
-            "status": "ended",
-            "humanSummary": "",
-            "humanKeywords": [],
-            "humanNotes": "",
-            "aiSummary": "",
-            "reviewCount": 1,
-            "lastReviewAt": now,
         })
 
-        call_ref.collection("reviews").add({
+        writer.create(call_ref.collection("reviews").document(), {
+            **review_base,
             "callId": c["call_id"],
-            "writerUserId": user_a,
-            "writerNameSnapshot": "Jungwon",
             "mentionedResidences": c["residences"],
-            "humanSummary": "대화가 자연스럽고 감정이 잘 드러났음",
-            "humanKeywords": ["따뜻함"],
-            "mood": "warm",
-            "comment": "다음에도 비슷한 질문을 이어가면 좋겠다",
-            "createdAt": now,
         })
 
-    for i, c in enumerate(calls_2):
-        call_ref = db.collection("calls").document(c["call_id"])
-
-        created_at = (now - timedelta(days=10 - i))
-        answered_at = created_at + timedelta(seconds=7)
-        ended_at = created_at + timedelta(seconds=540)
-        channel_name = f"{group_id_2}_{user_c}_{receiver_id_2}_{int(created_at.timestamp() * 1000)}"
-
-        call_ref.set({
+    call_base = {
+        "groupId": group_id_2,
+        "receiverId": receiver_id_2,
+        "caregiverUserId": user_c,
+        "groupNameSnapshot": "Seoul Memory Group",
+        "giverNameSnapshot": "Minho",
+        "receiverNameSnapshot": "박정희",
+        "durationSec": 540,
+        "status": "ended",
+        "humanSummary": "",
+        "humanKeywords": [],
+        "humanNotes": "",
+        "aiSummary": "",
+        "reviewCount": 1,
+        "lastReviewAt": now,
+    }
+    review_base = {
+        "writerUserId": user_c,
+        "writerNameSnapshot": "Minho",
+        "humanSummary": "기억이 선명하고 디테일이 풍부함",
+        "humanKeywords": ["추억", "변화"],
+        "mood": "reflective",
+        "comment": "다음에는 가족 구성원 이야기를 더 물어보자",
+        "createdAt": now,
+    }
+    channel_prefix = f"{group_id_2}_{user_c}_{receiver_id_2}_"
+    answer_delay = timedelta(seconds=7)
+    call_length = timedelta(seconds=540)
+    for i, c in enumerate(CALLS_2):
+        call_ref = calls_col.document(c["call_id"])
+
+        created_at = now - timedelta(days=10 - i)
+        answered_at = created_at + answer_delay
+        ended_at = created_at + call_length
+
+        writer.set(call_ref, {
+            **call_base,
             "callId": c["call_id"],
-            "channelName": channel_name,
-            "groupId": group_id_2,
-            "receiverId": receiver_id_2,
-            "caregiverUserId": user_c,
-            "groupNameSnapshot": "Seoul Memory Group",
-            "giverNameSnapshot": "Minho",
-            "receiverNameSnapshot": "박정희",
+            "channelName": f"{channel_prefix}{int(created_at.timestamp() * 1000)}",
             "createdAt": created_at,
             "answeredAt": answered_at,
             "endedAt": ended_at,
-            "durationSec": 540,
-            "status": "ended",
-            "humanSummary": "",
-            "humanKeywords": [],
-            "humanNotes": "",
-            "aiSummary": "",
-            "reviewCount": 1,
-            "lastReviewAt": now,
         })
 
-        call_ref.collection("reviews").add({
+        writer.create(call_ref.collection("reviews").document(), {
+            **review_base,
             "callId": c["call_id"],
-            "writerUserId": user_c,
-            "writerNameSnapshot": "Minho",
             "mentionedResidences": c["residences"],
-            "humanSummary": "기억이 선명하고 디테일이 풍부함",
-            "humanKeywords": ["추억", "변화"],
-            "mood": "reflective",
-            "comment": "다음에는 가족 구성원 이야기를 더 물어보자",
-            "createdAt": now,
         })
 
+    writer.close()
     print("✅ Seed completed successfully (production)")
 
 
@@ -474,81 +392,41 @@ def seed_receiver_copy(db):
     group_id = "group_1"
     receiver_id_3 = "5tIJ9f6E5TMOVgXsTSB9s9mbtC42"
 
-    residences = [
-        {
-            "id": "res_1950s_andong",
-            "era": "1950~1965",
-            "location": "경상북도 안동시",
-            "detail": "태어난 곳, 어린 시절",
-        },
-        {
-            "id": "res_1960s_jongno",
-            "era": "1966~1975",
-            "location": "서울 종로구",
-            "detail": "학창시절, 결혼 전",
-        },
-        {
-            "id": "res_1975s_gangnam",
-            "era": "1976~1989",
-            "location": "서울 강남구",
-            "detail": "신혼, 자녀 양육기",
-        },
-        {
-            "id": "res_1990s_bundang",
-            "era": "1990~2010",
-            "location": "경기도 분당",
-            "detail": "자녀 독립 후",
-        },
-        {
-            "id": "res_2010s_seocho",
-            "era": "2011~현재",
-            "location": "서울 서초구",
-            "detail": "현재 거주지",
-        },
-    ]
-
-    now = datetime.now(ZoneInfo("America/New_York"))
+    now = datetime.now(NY_TZ)
+    # The receiver and its residence_stats commit atomically
+    batch = db.batch()
 
-    db.collection("receivers").document(receiver_id_3).set({
+    batch.set(db.collection("receivers").document(receiver_id_3), {
         "receiverId": receiver_id_3,
         "groupId": group_id,
         "name": "Seonghoon",
         "profileImage": "https://placehold.co/200x200",
-        "majorResidences": [
-            {
-                "residenceId": r["id"],
-                "era": _non_empty_str(r.get("era"), "시기 미상"),
-                "location": _non_empty_str(r.get("location"), "장소 미상"),
-                "detail": _non_empty_str(r.get("detail"), ""),
-            }
-            for r in residences
-        ],
+        "majorResidences": MAJOR_RESIDENCES,
     })
 
-    for r in residences:
-        era = _non_empty_str(r.get("era"), "시기 미상")
-        location = _non_empty_str(r.get("location"), "장소 미상")
-        detail = _non_empty_str(r.get("detail"), "")
+    stats_col_3 = db.collection("receivers").document(receiver_id_3).collection("residence_stats")
+    for r in MAJOR_RESIDENCES:
+        era, location, detail = r["era"], r["location"], r["detail"]
         ai_summary = (
             f"{era}({location})의 기억은 일상과 관계 중심으로 정리됩니다."
             + (f" 주요 단서: {detail}." if detail else "")
         )
 
-        db.collection("receivers").document(receiver_id_3) \
-            .collection("residence_stats").document(r["id"]).set({
-                "groupId": group_id,
-                "receiverId": receiver_id_3,
-                "residenceId": r["id"],
-                "era": era,
-                "location": location,
-                "detail": detail,
-                "keywords": ["가족", "추억"],
-                "totalCalls": 1,
-                "lastCallAt": now,
-                "aiSummary": ai_summary,
-                "humanComments": ["이 시절 이야기가 자주 등장함"],
-            })
+        batch.set(stats_col_3.document(r["residenceId"]), {
+            "groupId": group_id,
+            "receiverId": receiver_id_3,
+            "residenceId": r["residenceId"],
+            "era": era,
+            "location": location,
+            "detail": detail,
+            "keywords": ["가족", "추억"],
+            "totalCalls": 1,
+            "lastCallAt": now,
+            "aiSummary": ai_summary,
+            "humanComments": ["이 시절 이야기가 자주 등장함"],
+        })
 
+    batch.commit()
     print("✅ Receiver copy completed (production)")
 
 